@@ -1,46 +1,279 @@
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, abort, jsonify, make_response, render_template, request, send_from_directory, url_for
 import json
-import pandas as pd
+import os
+import re
+from co_interest import CoInterestCache
+from dataset_registry import DatasetRegistry
+from dataset_snapshot import current_source_signature, load_snapshot
+from graph_analytics import METRICS_FILE, load_network_metrics
+from name_search import NameSearchIndex
+from professor_store import ProfessorStore
+from semantic_search import SemanticSearchIndex
+from thumbnails import THUMBNAIL_DIR, AtlasManifestWatcher
 
 app = Flask(__name__)
 
-# Cargar datos de profesores
-try:
-    profesores_df = pd.read_json('profesores_completos.json')
-    profesores_df['id'] = profesores_df['name'] # Usar el nombre como id
-except FileNotFoundError:
-    profesores_df = pd.DataFrame()
+DATA_FILE = 'profesores_completos.json'
+EMBEDDINGS_FILE = 'profesores_embeddings.npz'
+
+# Datasets adicionales (p. ej. otras universidades): un subdirectorio de
+# DATASETS_DIR por dataset, con los mismos archivos que genera el pipeline.
+# Sin el parámetro `dataset` se usan los archivos del directorio actual.
+DATASETS_DIR = 'datasets'
+DEFAULT_DATASET = ''
+DATASET_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_-]+$')
+
+# Memoria máxima de los datasets cargados; al superarla se descartan los
+# menos usados recientemente
+DATASET_MEMORY_BUDGET = 1024 * 1024 * 1024
+
+# Cada cuánto se revisa si un dataset cambió en disco (segundos)
+RELOAD_CHECK_INTERVAL = 2.0
+
+def dataset_dir(name):
+    """
+    Directorio de un dataset por su nombre (None si no existe)
+    """
+    if name == DEFAULT_DATASET:
+        return ''
+    if not DATASET_NAME_PATTERN.match(name):
+        return None
+    path = os.path.join(DATASETS_DIR, name)
+    return path if os.path.isdir(path) else None
+
+class LoadedDataset:
+    """
+    Instantánea de un dataset y todo lo que se deriva de ella. Al recargar se
+    reemplaza completa, así cada request trabaja con una sola versión.
+    """
+
+    def __init__(self, data_dir):
+        self.data_path = os.path.join(data_dir, DATA_FILE)
+
+        # Métricas precalculadas por graph_analytics.py (modularidad de las comunidades)
+        self.network_metrics = load_network_metrics(os.path.join(data_dir, METRICS_FILE))
+
+        # Instantánea binaria compartida entre procesos (mmap de solo lectura)
+        # con las respuestas de /graph-data ya serializadas para cada modo de
+        # agrupación, la versión del dataset y el historial de deltas
+        self.snapshot = load_snapshot(self.data_path, self.network_metrics)
+        self.version = self.snapshot.version if self.snapshot is not None else 0
+
+        # Datos de profesores: columnas tipadas sobre la instantánea, sin pandas
+        self.store = ProfessorStore.from_snapshot(self.snapshot)
+
+        # Índice de nombres para /search, construido una sola vez al cargar los datos
+        self.name_index = NameSearchIndex(self.store.names)
+        print(f"Índice de nombres construido: {self.name_index.stats()}")
+
+        # Embeddings precalculados para /semantic-search; el modelo se carga en
+        # segundo plano para que esté listo antes de la primera consulta
+        self.semantic_index = SemanticSearchIndex(
+            os.path.join(data_dir, EMBEDDINGS_FILE),
+            self.store.names,
+            self.store.values('degree_level'),
+            self.store.values('normalized_university'),
+        )
+        self.semantic_index.warm_up()
+
+        # Aristas de co-interés, calculadas bajo demanda y descartadas junto
+        # con el dataset
+        self.co_interest = CoInterestCache(self.store.interest_matrix)
+
+    @property
+    def memory_bytes(self):
+        """
+        Memoria aproximada del dataset: instantánea, índice de nombres,
+        embeddings y aristas de co-interés cacheadas
+        """
+        size = self.name_index.memory_bytes + self.co_interest.memory_bytes
+        if self.snapshot is not None:
+            size += os.path.getsize(self.snapshot.path)
+        if self.semantic_index.available:
+            size += self.semantic_index.embeddings.nbytes
+        return size
+
+    def is_stale(self):
+        source = self.snapshot.source if self.snapshot is not None else None
+        return source != current_source_signature(self.data_path)
+
+# Datasets cargados bajo demanda, en una caché LRU limitada por memoria
+datasets = DatasetRegistry(
+    lambda name: LoadedDataset(dataset_dir(name)),
+    lambda data: data.memory_bytes,
+    DATASET_MEMORY_BUDGET,
+    is_stale=lambda data: data.is_stale(),
+    check_interval=RELOAD_CHECK_INTERVAL,
+)
+
+def requested_dataset_name():
+    """
+    Nombre del dataset pedido con ?dataset=<nombre>; responde 404 si no existe
+    """
+    name = request.args.get('dataset', DEFAULT_DATASET)
+    if dataset_dir(name) is None:
+        abort(make_response(jsonify({"error": f"Dataset desconocido: '{name}'"}), 404))
+    return name
+
+def current_dataset():
+    """
+    Dataset del request actual, cargándolo o recargándolo si hace falta
+    """
+    return datasets.get(requested_dataset_name())
+
+# Atlas de miniaturas generado por thumbnails.py, releído si se regenera
+thumbnail_atlas_manifest = AtlasManifestWatcher(THUMBNAIL_DIR, RELOAD_CHECK_INTERVAL)
+
+# Las miniaturas (hash de su URL) y los atlas (hash de su contenido) nunca
+# cambian de contenido con el mismo nombre y se cachean como inmutables. El
+# manifiesto atlas.json sí cambia y solo se expone por /thumbnails/atlas.
+THUMBNAIL_MAX_AGE = 365 * 24 * 3600
+THUMBNAIL_FILE_PATTERN = re.compile(r'^(atlas-)?[0-9a-f]+\.jpg$')
+
+# Límite de resultados por búsqueda
+MAX_SEARCH_RESULTS = 20
+# Límite de vecinos por profesor en /co-interest
+MAX_CO_INTEREST_NEIGHBORS = 50
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return render_template('index.html', dataset=requested_dataset_name())
 
 @app.route('/graph-data')
 def graph_data():
     group_by = request.args.get('groupBy', 'interest_areas')
+    since = request.args.get('since', type=int)
+    data = current_dataset()
 
-    if profesores_df.empty:
+    if len(data.store) == 0:
         return jsonify({"nodes": [], "groups": []})
 
-    nodes = profesores_df.to_dict('records')
-    
-    groups = {}
-    if group_by == 'interest_areas':
-        for _, professor in profesores_df.iterrows():
-            for area in professor['interest_areas']:
-                if area not in groups:
-                    groups[area] = []
-                groups[area].append(professor['id'])
-    elif group_by == 'specialization':
-        for _, professor in profesores_df.iterrows():
-            spec = professor['normalized_specialization']
-            if spec not in groups:
-                groups[spec] = []
-            groups[spec].append(professor['id'])
-
-    group_list = [{"name": name, "members": members} for name, members in groups.items()]
-
-    return jsonify({"nodes": nodes, "groups": group_list})
+    # Con ?lod=1 se envía un supernodo por grupo (precalculado en la
+    # instantánea); los miembros se piden luego con /graph-data/group
+    if request.args.get('lod', type=int):
+        aggregate = data.snapshot.aggregate_payload(group_by)
+        if aggregate is None:
+            return jsonify({"error": f"Modo de agrupación desconocido: '{group_by}'"}), 404
+        response = Response(bytes(aggregate), mimetype='application/json')
+        response.headers['X-Dataset-Version'] = str(data.version)
+        return response
+
+    # Con ?since=<versión> solo se envían los cambios, si el historial de la
+    # instantánea llega hasta esa versión
+    delta = data.snapshot.delta_since(since, group_by) if since is not None else None
+    if delta is not None:
+        response = jsonify(delta)
+    else:
+        # Los modos de agrupación conocidos están pre-serializados en la instantánea
+        payload = data.snapshot.payload(group_by)
+        if payload is not None:
+            response = Response(bytes(payload), mimetype='application/json')
+        else:
+            response = jsonify({"nodes": data.store.records(), "groups": []})
+
+    response.headers['X-Dataset-Version'] = str(data.version)
+    return response
+
+@app.route('/graph-data/group')
+def graph_data_group():
+    group_by = request.args.get('groupBy', 'interest_areas')
+    name = request.args.get('name', '')
+    # Con ?ungrouped=1 se piden los profesores sin grupo (el supernodo 'ungrouped')
+    ungrouped = request.args.get('ungrouped', type=int)
+    data = current_dataset()
+
+    if data.snapshot is None:
+        rows = None
+    elif ungrouped:
+        rows = data.snapshot.ungrouped_rows(group_by)
+    else:
+        rows = data.snapshot.group_rows(group_by, name)
+    if rows is None:
+        return jsonify({"error": f"Grupo desconocido: '{name}'"}), 404
+
+    # Mismo formato que /graph-data, con solo los miembros del grupo
+    nodes = data.store.records(rows)
+    groups = [] if ungrouped else [{"name": name, "members": [node['id'] for node in nodes]}]
+    response = jsonify({"nodes": nodes, "groups": groups})
+    response.headers['X-Dataset-Version'] = str(data.version)
+    return response
+
+@app.route('/search')
+def search():
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 10, type=int)
+    limit = max(1, min(limit, MAX_SEARCH_RESULTS))
+
+    return jsonify({"query": query, "results": current_dataset().name_index.search(query, limit)})
+
+@app.route('/semantic-search')
+def semantic_search():
+    query = request.args.get('q', '')
+    limit = request.args.get('limit', 10, type=int)
+    limit = max(1, min(limit, MAX_SEARCH_RESULTS))
+
+    semantic_index = current_dataset().semantic_index
+    if not semantic_index.available:
+        return jsonify({"error": "La búsqueda semántica no está disponible"}), 503
+
+    results = semantic_index.search(
+        query,
+        top_k=limit,
+        degree_level=request.args.get('degree_level'),
+        university=request.args.get('normalized_university'),
+    )
+    return jsonify({"query": query, "results": results})
+
+@app.route('/co-interest')
+def co_interest():
+    top_k = request.args.get('k', 10, type=int)
+    top_k = max(1, min(top_k, MAX_CO_INTEREST_NEIGHBORS))
+    min_weight = request.args.get('min_weight', 0.1, type=float)
+
+    name = requested_dataset_name()
+    data = datasets.get(name)
+    if len(data.store) == 0:
+        return jsonify({"edges": []})
+
+    sources, targets, weights = data.co_interest.get_edges(top_k, min_weight)
+    # Las aristas nuevas cuentan para el presupuesto de memoria
+    datasets.update_size(name, data)
+    ids = data.store.names
+    edges = [
+        {"source": ids[source], "target": ids[target], "weight": round(float(weight), 3)}
+        for source, target, weight in zip(sources.tolist(), targets.tolist(), weights.tolist())
+    ]
+    return jsonify({"edges": edges})
+
+@app.route('/metrics/datasets')
+def dataset_metrics():
+    return jsonify(datasets.metrics())
+
+@app.route('/thumbnails/atlas')
+def thumbnail_atlas():
+    thumbnail_manifest = thumbnail_atlas_manifest.get()
+    if thumbnail_manifest is None:
+        return jsonify({"error": "No hay miniaturas generadas"}), 404
+
+    files = thumbnail_manifest.get('files', {})
+    return jsonify({
+        "image": url_for('thumbnail_file', filename=thumbnail_manifest['image']),
+        "tile_size": thumbnail_manifest['tile_size'],
+        "width": thumbnail_manifest['width'],
+        "height": thumbnail_manifest['height'],
+        "tiles": thumbnail_manifest['tiles'],
+        "files": {url: url_for('thumbnail_file', filename=filename) for url, filename in files.items()},
+    })
+
+@app.route('/thumbnails/<path:filename>')
+def thumbnail_file(filename):
+    if not THUMBNAIL_FILE_PATTERN.match(filename):
+        abort(404)
+    # Ruta absoluta: Flask resolvería una relativa desde la carpeta de la app
+    response = send_from_directory(os.path.abspath(THUMBNAIL_DIR), filename, max_age=THUMBNAIL_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 if __name__ == '__main__':
     app.run(debug=True, port=5001) 
\ No newline at end of file
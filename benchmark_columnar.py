@@ -0,0 +1,87 @@
+"""
+Compara el JSON del dataset con su versión columnar (.npz): tamaño en disco
+y tiempo de carga completa y de un subconjunto de columnas.
+
+Uso: python benchmark_columnar.py [ruta_json]
+"""
+import json
+import os
+import sys
+import time
+
+from columnar_dataset import ColumnarDataset, columnar_path_for, write_columnar
+
+DATA_PATH = 'profesores_completos.json'
+SUBSET_COLUMNS = ['name', 'research_papers', 'degree_level']
+REPEATS = 5
+
+
+def _best_time(function) -> float:
+    """
+    Mejor tiempo de REPEATS ejecuciones
+    """
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _load_json(json_path: str, columns=None):
+    with open(json_path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    if columns is not None:
+        records = [{key: record[key] for key in columns if key in record} for record in records]
+    return records
+
+
+def _load_columnar(path: str, columns=None):
+    dataset = ColumnarDataset(path)
+    try:
+        return dataset.records(columns)
+    finally:
+        dataset.close()
+
+
+def main():
+    """
+    Escribe la versión columnar del JSON y compara ambos formatos
+    """
+    json_path = sys.argv[1] if len(sys.argv) > 1 else DATA_PATH
+
+    if not os.path.exists(json_path):
+        print(f"❌ Error: No se encontró el archivo '{json_path}'")
+        return
+
+    records = _load_json(json_path)
+    # Se escribe al lado del JSON con otro nombre para no alterar el dataset
+    columnar_path = columnar_path_for(json_path).replace('.npz', '.benchmark.npz')
+    write_columnar(records, columnar_path)
+
+    # Verificar que el formato columnar reconstruye los mismos registros
+    if _load_columnar(columnar_path) != records:
+        print("❌ Error: los registros del formato columnar no coinciden con el JSON")
+        return
+
+    print(f"📊 Comparando formatos para {len(records)} profesores")
+
+    results = {
+        'professors': len(records),
+        'json_mb': round(os.path.getsize(json_path) / 1024 / 1024, 2),
+        'npz_mb': round(os.path.getsize(columnar_path) / 1024 / 1024, 2),
+        'json_full_seconds': round(_best_time(lambda: _load_json(json_path)), 4),
+        'npz_full_seconds': round(_best_time(lambda: _load_columnar(columnar_path)), 4),
+        'json_subset_seconds': round(_best_time(lambda: _load_json(json_path, SUBSET_COLUMNS)), 4),
+        'npz_subset_seconds': round(_best_time(lambda: _load_columnar(columnar_path, SUBSET_COLUMNS)), 4),
+    }
+    os.remove(columnar_path)
+
+    print(f"Tamaño: JSON {results['json_mb']} MB, npz {results['npz_mb']} MB")
+    print(f"Carga completa: JSON {results['json_full_seconds']}s, npz {results['npz_full_seconds']}s")
+    print(f"Carga de {SUBSET_COLUMNS}: JSON {results['json_subset_seconds']}s, npz {results['npz_subset_seconds']}s")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Compara la carga del dataset por proceso (pandas, como hacía app.py) con la
+instantánea compartida por mmap (dataset_snapshot.py) para 1 y 8 workers.
+
+Cada worker es un proceso aparte que carga los datos y queda en espera; con
+todos vivos se mide su RSS y su PSS (memoria proporcional: las páginas
+compartidas se reparten entre los procesos que las usan) y el tiempo que
+tardó cada uno en estar listo.
+
+Uso: python benchmark_snapshot.py [ruta_json]
+"""
+import json
+import mmap
+import os
+import subprocess
+import sys
+import time
+
+from dataset_snapshot import GROUP_MODES, load_snapshot, snapshot_path_for
+
+DATA_PATH = 'profesores_completos.json'
+WORKER_COUNTS = (1, 8)
+
+
+def _worker(mode: str, json_path: str) -> None:
+    """
+    Carga los datos como lo haría un worker del servidor y espera en stdin
+    """
+    start = time.perf_counter()
+    if mode == 'legacy':
+        import pandas as pd
+        df = pd.read_json(json_path)
+        df['id'] = df['name']
+        records = df.to_dict('records')
+        # Cada worker serializa y guarda sus propias respuestas
+        payloads = [json.dumps({'nodes': records, 'group_by': m}, default=str).encode() for m in GROUP_MODES]
+    else:
+        snapshot = load_snapshot(json_path)
+        payloads = [snapshot.payload(m) for m in GROUP_MODES]
+        # Tocar una vez cada página para que quede residente
+        for view in payloads:
+            if view is not None:
+                sum(view[::mmap.PAGESIZE])
+    print(f"ready {time.perf_counter() - start:.4f}", flush=True)
+    sys.stdin.read()
+    del payloads
+
+
+def _memory_kb(pid: int) -> dict:
+    """
+    RSS y PSS de un proceso en KB (de /proc/<pid>/smaps_rollup)
+    """
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if key in ('Rss', 'Pss'):
+                values[key.lower()] = int(rest.split()[0])
+    return values
+
+
+def run(mode: str, workers: int, json_path: str) -> dict:
+    """
+    Lanza `workers` procesos a la vez y mide memoria total y tiempos de arranque
+    """
+    launched = time.perf_counter()
+    processes = [
+        subprocess.Popen([sys.executable, __file__, '--worker', mode, json_path],
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for _ in range(workers)
+    ]
+    startup = [float(p.stdout.readline().split()[1]) for p in processes]
+    all_ready = time.perf_counter() - launched
+
+    memory = [_memory_kb(p.pid) for p in processes]
+    for p in processes:
+        p.stdin.close()
+        p.wait()
+
+    return {
+        'mode': mode,
+        'workers': workers,
+        'rss_mb': round(sum(m['rss'] for m in memory) / 1024, 1),
+        'pss_mb': round(sum(m['pss'] for m in memory) / 1024, 1),
+        'load_seconds_max': round(max(startup), 4),
+        'all_ready_seconds': round(all_ready, 4),
+    }
+
+
+def main():
+    """
+    Ejecuta la comparación y muestra los resultados
+    """
+    json_path = sys.argv[1] if len(sys.argv) > 1 else DATA_PATH
+
+    if not os.path.exists(json_path):
+        print(f"❌ Error: No se encontró el archivo '{json_path}'")
+        return
+
+    print(f"📊 Comparando carga del dataset: {json_path}")
+
+    # Construir la instantánea antes para medir solo la apertura
+    start = time.perf_counter()
+    load_snapshot(json_path)
+    print(f"Instantánea lista en {time.perf_counter() - start:.2f}s "
+          f"({os.path.getsize(snapshot_path_for(json_path)) / 1024 / 1024:.1f} MB)")
+
+    results = []
+    for mode in ('legacy', 'snapshot'):
+        for workers in WORKER_COUNTS:
+            result = run(mode, workers, json_path)
+            results.append(result)
+            print(f"{mode:>8} x{workers}: RSS {result['rss_mb']} MB, PSS {result['pss_mb']} MB, "
+                  f"carga {result['load_seconds_max']}s, todos listos en {result['all_ready_seconds']}s")
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--worker':
+        _worker(sys.argv[2], sys.argv[3])
+    else:
+        main()
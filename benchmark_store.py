@@ -0,0 +1,98 @@
+"""
+Compara el DataFrame de pandas que usaba app.py con ProfessorStore.
+
+Cada variante se ejecuta en un proceso aparte y se mide: tiempo de import de
+sus módulos, tiempo de carga de los datos, memoria residente (RSS) al final
+y tiempo de recorrer todos los registros como hace /graph-data.
+
+Uso: python benchmark_store.py [ruta_json]
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+DATA_PATH = 'profesores_completos.json'
+
+
+def _rss_mb() -> float:
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _measure(mode: str, json_path: str) -> dict:
+    """
+    Carga los datos con una de las dos variantes y devuelve las mediciones
+    """
+    start = time.perf_counter()
+    if mode == 'pandas':
+        import pandas as pd
+        imported = time.perf_counter()
+        df = pd.read_json(json_path)
+        df['id'] = df['name']
+        names = df['name'].tolist()
+        loaded = time.perf_counter()
+        records = df.to_dict('records')
+        groups = {}
+        for _, professor in df.iterrows():
+            groups.setdefault(professor['normalized_specialization'], []).append(professor['id'])
+    else:
+        from dataset_snapshot import load_snapshot
+        from professor_store import ProfessorStore
+        imported = time.perf_counter()
+        store = ProfessorStore.from_snapshot(load_snapshot(json_path))
+        names = store.names
+        loaded = time.perf_counter()
+        records = store.records()
+        groups = {}
+        for name, spec in zip(names, store.values('normalized_specialization')):
+            groups.setdefault(spec, []).append(name)
+    iterated = time.perf_counter()
+
+    return {
+        'mode': mode,
+        'rows': len(names),
+        'import_seconds': round(imported - start, 3),
+        'load_seconds': round(loaded - imported, 3),
+        'iterate_seconds': round(iterated - loaded, 3),
+        'rss_mb': round(_rss_mb(), 1),
+    }
+
+
+def main():
+    """
+    Ejecuta ambas variantes y muestra los resultados
+    """
+    json_path = sys.argv[1] if len(sys.argv) > 1 else DATA_PATH
+
+    if not os.path.exists(json_path):
+        print(f"❌ Error: No se encontró el archivo '{json_path}'")
+        return
+
+    print(f"📊 Comparando pandas vs ProfessorStore: {json_path}")
+
+    # Construir la instantánea antes para medir solo la apertura
+    from dataset_snapshot import load_snapshot
+    load_snapshot(json_path)
+
+    results = []
+    for mode in ('pandas', 'store'):
+        output = subprocess.run([sys.executable, __file__, '--measure', mode, json_path],
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        results.append(result)
+        print(f"{mode:>7}: import {result['import_seconds']}s, carga {result['load_seconds']}s, "
+              f"recorrido {result['iterate_seconds']}s, RSS {result['rss_mb']} MB")
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--measure':
+        print(json.dumps(_measure(sys.argv[2], sys.argv[3])))
+    else:
+        main()
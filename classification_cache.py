@@ -0,0 +1,176 @@
+"""
+Caché entre ejecuciones de la clasificación de áreas de interés.
+
+Guarda, por profesor, el score de cada categoría de `areas_de_interes.json`
+sin filtrar por el score mínimo, junto con la "firma" de cada categoría (el
+texto que realmente ve el modelo: la etiqueta para zero-shot, la
+descripción para similitud). En la siguiente ejecución se compara el
+diccionario de categorías con el anterior y solo se infieren las categorías
+nuevas o modificadas; las eliminadas simplemente se descartan. Con
+zero-shot multi-etiqueta cada categoría se puntúa por separado, así que
+combinar scores de distintas ejecuciones da el mismo resultado que
+recalcularlos todos.
+
+Los profesores se identifican por su nombre y el hash de su texto: si el
+contenido de un profesor cambia, se recalculan todas sus categorías.
+
+Mientras se clasifica, los scores se van agregando por bloques a un archivo
+de avance (CHECKPOINT_PATH) para poder retomar una ejecución interrumpida.
+"""
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CACHE_PATH = 'clasificacion_cache.npz'
+CHECKPOINT_PATH = 'clasificacion_checkpoint.jsonl'
+CACHE_FORMAT_VERSION = 1
+
+
+def professor_key(name: str, text: str) -> str:
+    """
+    Identidad de un profesor para la caché (nombre + hash del texto clasificado)
+    """
+    return hashlib.sha1(f"{name}\n{text}".encode('utf-8')).hexdigest()
+
+
+class ClassificationCache:
+    """
+    Scores (profesores x categorías) de una ejecución anterior para un
+    método y modelo dados. `vectors` guarda los embeddings de los profesores
+    cuando el método los necesita para puntuar categorías nuevas.
+    """
+
+    def __init__(self, method: str, model_name: str, keys: Sequence[str] = (),
+                 categories: Optional[Dict[str, str]] = None, scores: Optional[np.ndarray] = None,
+                 vectors: Optional[np.ndarray] = None):
+        self.method = method
+        self.model_name = model_name
+        self.keys = list(keys)
+        self.categories: Dict[str, str] = dict(categories or {})
+        self.scores = scores if scores is not None else np.zeros((len(self.keys), len(self.categories)))
+        self.vectors = vectors
+        self._rows = {key: i for i, key in enumerate(self.keys)}
+        self._columns = {category: i for i, category in enumerate(self.categories)}
+
+    @classmethod
+    def load(cls, path: str, method: str, model_name: str) -> 'ClassificationCache':
+        """
+        Caché guardada en `path`, o una vacía si no existe o corresponde a
+        otro método o modelo
+        """
+        empty = cls(method, model_name)
+        if not os.path.exists(path):
+            return empty
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+                if (meta.get('format') != CACHE_FORMAT_VERSION or meta.get('method') != method
+                        or meta.get('model_name') != model_name):
+                    return empty
+                vectors = data['vectors'] if 'vectors' in data else None
+                return cls(method, model_name, meta['keys'], meta['categories'], data['scores'], vectors)
+        except Exception as e:
+            print(f"⚠️ No se pudo leer la caché de clasificación '{path}': {e}")
+            return empty
+
+    def save(self, path: str) -> None:
+        meta = {
+            'format': CACHE_FORMAT_VERSION,
+            'method': self.method,
+            'model_name': self.model_name,
+            'keys': self.keys,
+            'categories': self.categories,
+        }
+        arrays = {
+            'meta': np.frombuffer(json.dumps(meta, ensure_ascii=False).encode('utf-8'), dtype=np.uint8),
+            # float64: los scores combinados deben coincidir con los recién calculados
+            'scores': np.asarray(self.scores, dtype=np.float64),
+        }
+        if self.vectors is not None:
+            arrays['vectors'] = np.asarray(self.vectors, dtype=np.float32)
+
+        temp_path = f"{path}.tmp{os.getpid()}"
+        with open(temp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(temp_path, path)
+
+    def diff(self, categories: Dict[str, str]) -> Tuple[List[str], List[str], List[str]]:
+        """
+        Compara las categorías actuales (nombre -> firma) con las guardadas.
+
+        Retorna (sin cambios, nuevas o modificadas, eliminadas).
+        """
+        unchanged = [name for name, signature in categories.items() if self.categories.get(name) == signature]
+        changed = [name for name, signature in categories.items() if self.categories.get(name) != signature]
+        removed = [name for name in self.categories if name not in categories]
+        return unchanged, changed, removed
+
+    def row(self, key: str) -> Optional[int]:
+        return self._rows.get(key)
+
+    def column(self, category: str) -> int:
+        return self._columns[category]
+
+
+class ClassificationCheckpoint:
+    """
+    Archivo de avance (JSON por línea, solo se agregan líneas) de una
+    clasificación en curso: cada línea guarda los scores de un profesor,
+    identificado por `professor_key`, para un grupo de categorías. Si la
+    ejecución se interrumpe, la siguiente retoma desde aquí; al terminar y
+    guardarse la caché, el archivo se elimina.
+    """
+
+    def __init__(self, path: str, method: str, model_name: str):
+        self.path = path
+        self.method = method
+        self.model_name = model_name
+
+    def load(self) -> Dict[str, Dict[str, float]]:
+        """
+        Scores guardados por profesor (categoría -> score). Se ignoran las
+        líneas de otro método o modelo y una última línea incompleta.
+        """
+        scores: Dict[str, Dict[str, float]] = {}
+        if not os.path.exists(self.path):
+            return scores
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get('method') == self.method and entry.get('model_name') == self.model_name:
+                    scores.setdefault(entry['key'], {}).update(entry['scores'])
+        return scores
+
+    def append(self, entries: List[Tuple[str, Dict[str, float]]]) -> None:
+        """
+        Agrega los scores de un bloque de profesores y los lleva a disco
+        """
+        if not entries:
+            return
+        # Si la ejecución anterior se cortó a mitad de una línea, cerrarla
+        # para no mezclarla con la siguiente
+        if os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                incomplete = f.read(1) != b'\n'
+        else:
+            incomplete = False
+
+        with open(self.path, 'a', encoding='utf-8') as f:
+            if incomplete:
+                f.write('\n')
+            for key, scores in entries:
+                line = {'key': key, 'method': self.method, 'model_name': self.model_name, 'scores': scores}
+                f.write(json.dumps(line, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def remove(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
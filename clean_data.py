@@ -1,6 +1,8 @@
 import json
 from typing import Dict, Any, List
 
+from columnar_dataset import load_professors, save_professors
+
 def clean_professor_data(professors_data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Limpia los datos de profesores eliminando campos redundantes e innecesarios
@@ -22,7 +24,10 @@ def clean_professor_data(professors_data: List[Dict[str, Any]]) -> List[Dict[str
         'url_image',                 # URL de imagen del profesor
         'original_degree',           # Grado académico original (referencia)
         'original_university',       # Universidad original (referencia)
-        'specialization'             # Especialización sin normalizar
+        'specialization',            # Especialización sin normalizar
+        'community',                 # Comunidad de co-interés (graph_analytics.py)
+        'pagerank',                  # PageRank en la red de co-interés
+        'betweenness'                # Intermediación en la red de co-interés
     }
     
     # Campos a eliminar (redundantes o innecesarios)
@@ -102,9 +107,8 @@ def main():
     try:
         print("🧹 Iniciando limpieza de datos...")
         
-        # Cargar datos originales
-        with open(input_file, 'r', encoding='utf-8') as f:
-            original_data = json.load(f)
+        # Cargar datos originales (JSON o formato columnar, el más reciente)
+        original_data = load_professors(input_file)
         
         print(f"📚 Procesando {len(original_data)} profesores...")
         
@@ -130,10 +134,9 @@ def main():
             print(f"  • {key}: {value}")
         
         # Guardar datos limpios
-        with open(input_file, 'w', encoding='utf-8') as f:
-            json.dump(cleaned_data, f, ensure_ascii=False, indent=2)
+        written = save_professors(cleaned_data, input_file)
         
-        print(f"\n✅ Datos limpios guardados en: {input_file}")
+        print(f"\n✅ Datos limpios guardados en: {', '.join(written)}")
         print("🎉 Limpieza completada exitosamente!")
         
     except FileNotFoundError:
@@ -0,0 +1,228 @@
+"""
+Red de co-interés entre profesores.
+
+Dos profesores se conectan si comparten áreas de interés; el peso de la
+arista es la suma, sobre las áreas compartidas, del producto de sus
+`interest_scores`. Se calcula como el producto disperso A @ A.T, donde A es
+la matriz (profesores x áreas) de scores, procesando A por bloques de filas
+para que ni el cálculo ni el resultado dejen de ser dispersos: de cada fila
+solo se conservan las `top_k` aristas más fuertes por encima de `min_weight`.
+
+Con áreas muy pobladas A @ A.T es prácticamente densa, así que el lado
+derecho del producto se limita a los MAX_CANDIDATES_PER_AREA miembros con
+mayor score de cada área (candidatos) y el peso de cada par candidato se
+recalcula luego de forma exacta. El resultado es exacto mientras ningún área
+supere ese límite de miembros.
+"""
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+# Máximo de productos parciales (no ceros) por bloque de A @ A.T
+MAX_BLOCK_NNZ = 5_000_000
+# Miembros de cada área que se consideran como vecinos candidatos (como
+# mínimo, CANDIDATES_PER_NEIGHBOR veces el top_k pedido)
+MAX_CANDIDATES_PER_AREA = 50
+CANDIDATES_PER_NEIGHBOR = 4
+EDGE_CACHE_SIZE = 8
+
+
+def build_interest_matrix(interest_areas: Sequence, interest_scores: Sequence) -> Tuple[sparse.csr_matrix, List[str]]:
+    """
+    Construye la matriz dispersa (profesores x áreas) ponderada por score.
+
+    Retorna la matriz CSR y la lista de áreas (orden de las columnas).
+    """
+    area_ids: Dict[str, int] = {}
+    indptr = [0]
+    indices = []
+    data = []
+
+    for areas, scores in zip(interest_areas, interest_scores):
+        areas = areas if isinstance(areas, list) else []
+        scores = scores if isinstance(scores, list) else []
+        for area, score in zip(areas, scores):
+            indices.append(area_ids.setdefault(area, len(area_ids)))
+            data.append(score)
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, len(area_ids)),
+    )
+    # Un área repetida en un mismo profesor se queda con la suma de scores
+    matrix.sum_duplicates()
+    return matrix, list(area_ids)
+
+
+def _top_members_per_area(matrix: sparse.csr_matrix, limit: int) -> sparse.csr_matrix:
+    """
+    Copia de la matriz que conserva, en cada área, solo los `limit` miembros
+    con mayor score
+    """
+    csc = matrix.tocsc()
+    counts = np.diff(csc.indptr)
+    if not len(counts) or counts.max() <= limit:
+        return matrix
+
+    columns = np.repeat(np.arange(csc.shape[1]), counts)
+    order = np.lexsort((-csc.data, columns))
+    rank = np.arange(len(order)) - csc.indptr[columns[order]]
+    keep = order[rank < limit]
+    pruned = sparse.csr_matrix((csc.data[keep], (csc.indices[keep], columns[keep])), shape=csc.shape)
+    return pruned
+
+
+def _row_blocks(matrix: sparse.csr_matrix, candidates: sparse.csr_matrix) -> List[Tuple[int, int]]:
+    """
+    Parte las filas en bloques cuyo producto con los candidatos no exceda
+    MAX_BLOCK_NNZ
+    """
+    # Cota superior de no ceros por fila: suma de los candidatos de sus áreas
+    area_sizes = np.bincount(candidates.indices, minlength=candidates.shape[1])
+    indicator = matrix.copy()
+    indicator.data = np.ones_like(indicator.data)
+    row_cost = np.asarray(indicator @ area_sizes, dtype=np.int64).ravel()
+
+    cumulative = np.cumsum(row_cost)
+    blocks = []
+    start = 0
+    n_rows = matrix.shape[0]
+    while start < n_rows:
+        offset = cumulative[start - 1] if start else 0
+        end = int(np.searchsorted(cumulative, offset + MAX_BLOCK_NNZ, side='right'))
+        end = min(max(end, start + 1), n_rows)
+        blocks.append((start, end))
+        start = end
+    return blocks
+
+
+def _pair_weights(matrix: sparse.csr_matrix, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """
+    Peso exacto (producto punto de filas de A) para cada par (rows[p], cols[p])
+    """
+    # Expandir cada par por las áreas de su primer extremo y buscar el score
+    # del segundo extremo en esa misma área
+    row_nnz = np.diff(matrix.indptr)[rows]
+    pair_ids = np.repeat(np.arange(len(rows)), row_nnz)
+    positions = np.repeat(matrix.indptr[rows] - np.cumsum(row_nnz) + row_nnz, row_nnz) + np.arange(row_nnz.sum())
+    areas = matrix.indices[positions]
+    other = matrix[cols[pair_ids], areas]
+    contributions = matrix.data[positions] * np.asarray(other, dtype=np.float32).ravel()
+    return np.bincount(pair_ids, weights=contributions, minlength=len(rows)).astype(np.float32)
+
+
+def co_interest_edges(matrix: sparse.csr_matrix, top_k: int = 10, min_weight: float = 0.1) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Calcula las aristas de co-interés.
+
+    Cada profesor aporta sus `top_k` vecinos más fuertes con peso >=
+    `min_weight`; la arista se conserva si aparece en la lista de cualquiera
+    de sus dos extremos. Retorna (origen, destino, peso) con origen < destino.
+    """
+    n_rows = matrix.shape[0]
+    if n_rows == 0 or matrix.nnz == 0 or top_k <= 0:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32)
+
+    candidates = _top_members_per_area(matrix, max(MAX_CANDIDATES_PER_AREA, CANDIDATES_PER_NEIGHBOR * top_k))
+    pruned = candidates is not matrix
+    transposed = candidates.T.tocsc()
+    sources, targets, weights = [], [], []
+
+    for start, end in _row_blocks(matrix, candidates):
+        block = (matrix[start:end] @ transposed).tocoo()
+        rows = block.row.astype(np.int64) + start
+        cols = block.col.astype(np.int64)
+        keep = rows != cols
+        rows, cols = rows[keep], cols[keep]
+
+        if pruned:
+            # El producto con candidatos solo suma las áreas donde el vecino
+            # es candidato: recalcular el peso exacto de cada par
+            data = _pair_weights(matrix, rows, cols)
+        else:
+            data = block.data[keep]
+
+        keep = data >= min_weight
+        rows, cols, data = rows[keep], cols[keep], data[keep]
+        if not len(data):
+            continue
+
+        # Ordenar por fila y, dentro de cada fila, por peso descendente (el
+        # peso escalado a [0, 0.5) no altera el orden entre filas) y quedarse
+        # con los top_k primeros
+        order = np.argsort(rows + 0.5 * (1.0 - data / (data.max() * 1.001)))
+        rows, cols, data = rows[order], cols[order], data[order]
+        row_starts = np.searchsorted(rows, rows, side='left')
+        keep = (np.arange(len(rows)) - row_starts) < top_k
+
+        sources.append(rows[keep])
+        targets.append(cols[keep])
+        weights.append(data[keep])
+
+    if not sources:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32)
+
+    sources = np.concatenate(sources)
+    targets = np.concatenate(targets)
+    weights = np.concatenate(weights)
+
+    # Aristas no dirigidas: normalizar (menor, mayor) y eliminar duplicados
+    low = np.minimum(sources, targets)
+    high = np.maximum(sources, targets)
+    _, unique = np.unique(low * n_rows + high, return_index=True)
+    return low[unique], high[unique], weights[unique]
+
+
+class CoInterestCache:
+    """
+    Caché LRU de las aristas de un dataset por (top_k, min_weight). La matriz
+    de intereses se construye con `build_matrix` una sola vez, la primera vez
+    que se necesita.
+    """
+
+    def __init__(self, build_matrix: Callable[[], sparse.csr_matrix], max_entries: int = EDGE_CACHE_SIZE):
+        self.build_matrix = build_matrix
+        self.max_entries = max_entries
+        self._matrix = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._matrix_lock = threading.Lock()
+
+    def matrix(self) -> sparse.csr_matrix:
+        with self._matrix_lock:
+            if self._matrix is None:
+                self._matrix = self.build_matrix()
+            return self._matrix
+
+    def get_edges(self, top_k: int, min_weight: float):
+        key = (top_k, min_weight)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        # Se calcula fuera del lock: los aciertos de otros parámetros no
+        # esperan a este cálculo
+        edges = co_interest_edges(self.matrix(), top_k, min_weight)
+        with self._lock:
+            self._entries[key] = edges
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return edges
+
+    @property
+    def memory_bytes(self) -> int:
+        """
+        Memoria de las aristas cacheadas y de la matriz de intereses
+        """
+        with self._lock:
+            size = sum(array.nbytes for edges in self._entries.values() for array in edges)
+        matrix = self._matrix
+        if matrix is not None:
+            size += matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+        return size
@@ -0,0 +1,138 @@
+"""
+Formato columnar en disco del dataset de profesores.
+
+Además de (o en lugar de) `profesores_completos.json`, las etapas del
+pipeline pueden guardar `profesores_completos.npz`: un archivo NumPy con una
+entrada por arreglo de cada columna, usando la misma codificación que la
+instantánea del servidor (dataset_snapshot.encode_columns: arreglos
+numéricos, strings con tabla de diccionario, listas en formato CSR). El
+cargador solo lee del disco las entradas de las columnas pedidas.
+
+`load_professors` usa el más reciente de los dos archivos, así que el
+pipeline puede mezclar etapas que escriben JSON y etapas que escriben ambos.
+"""
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from dataset_snapshot import ColumnReader, encode_columns, source_signature
+
+COLUMNAR_SUFFIX = '.npz'
+COLUMNAR_FORMAT_VERSION = 1
+
+# Formatos que escriben las etapas del pipeline. Quitar 'json' para guardar
+# solo el formato columnar (app.py y las etapas lo leen igual).
+OUTPUT_FORMATS = ('json', 'npz')
+
+_META_KEY = '__meta__'
+
+
+def columnar_path_for(json_path: str) -> str:
+    return os.path.splitext(json_path)[0] + COLUMNAR_SUFFIX
+
+
+def write_columnar(records: List[Dict[str, Any]], path: str) -> None:
+    """
+    Guarda los registros en formato columnar (sin comprimir, para que la
+    carga sea rápida)
+    """
+    columns, arrays = encode_columns(records)
+    meta = {'format': COLUMNAR_FORMAT_VERSION, 'count': len(records), 'columns': columns}
+    arrays[_META_KEY] = np.frombuffer(json.dumps(meta, ensure_ascii=False).encode('utf-8'), dtype=np.uint8)
+
+    # Archivo temporal + reemplazo atómico, igual que la instantánea
+    temp_path = f"{path}.tmp{os.getpid()}"
+    with open(temp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(temp_path, path)
+
+
+class ColumnarDataset:
+    """
+    Dataset columnar abierto para lectura; las columnas se leen bajo demanda
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._npz = np.load(path, allow_pickle=False)
+        meta = json.loads(self._npz[_META_KEY].tobytes().decode('utf-8'))
+        if meta.get('format') != COLUMNAR_FORMAT_VERSION:
+            raise ValueError(f"Versión de formato no soportada en '{path}'")
+        self.count = meta['count']
+        self.columns: Dict[str, Dict] = meta['columns']
+
+    def reader(self, columns: Optional[Sequence[str]] = None) -> ColumnReader:
+        """
+        ColumnReader con solo las columnas pedidas (todas si `columns` es None)
+        """
+        names = [name for name in self.columns if columns is None or name in columns]
+        specs = {name: self.columns[name] for name in names}
+        arrays = {section: self._npz[section] for spec in specs.values() for section in spec['arrays'].values()}
+        return ColumnReader(specs, arrays, self.count)
+
+    def records(self, columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Registros tal como se guardaron, solo con las columnas pedidas
+        """
+        return self.reader(columns).plain_records()
+
+    def close(self) -> None:
+        self._npz.close()
+
+
+def dataset_source(json_path: str) -> Optional[str]:
+    """
+    Archivo del que se debe leer el dataset: el más reciente entre el JSON y
+    su versión columnar (None si no existe ninguno)
+    """
+    candidates = [path for path in (columnar_path_for(json_path), json_path) if source_signature(path) is not None]
+    if not candidates:
+        return None
+    # Ante igual fecha gana el columnar (primero en la lista)
+    return max(candidates, key=lambda path: source_signature(path)['mtime_ns'])
+
+
+def load_professors(json_path: str, columns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Carga los profesores desde el formato más reciente disponible.
+
+    Con el formato columnar solo se leen las columnas pedidas; con JSON se
+    parsea todo el archivo y luego se filtran. Lanza FileNotFoundError si no
+    existe ninguno de los dos.
+    """
+    source = dataset_source(json_path)
+    if source is None:
+        raise FileNotFoundError(json_path)
+
+    if source.endswith(COLUMNAR_SUFFIX):
+        dataset = ColumnarDataset(source)
+        try:
+            return dataset.records(columns)
+        finally:
+            dataset.close()
+
+    with open(source, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    if columns is not None:
+        records = [{key: value for key, value in record.items() if key in columns} for record in records]
+    return records
+
+
+def save_professors(records: List[Dict[str, Any]], json_path: str, formats: Sequence[str] = OUTPUT_FORMATS,
+                    indent: int = 2) -> List[str]:
+    """
+    Guarda los profesores en los formatos indicados y retorna las rutas escritas
+    """
+    written = []
+    if 'json' in formats:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False, indent=indent)
+        written.append(json_path)
+    if 'npz' in formats:
+        # Se escribe después del JSON para que sea el más reciente
+        path = columnar_path_for(json_path)
+        write_columnar(records, path)
+        written.append(path)
+    return written
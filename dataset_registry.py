@@ -0,0 +1,190 @@
+"""
+Registro de los datasets cargados por el servidor.
+
+Cada dataset (con sus índices y cachés) se carga la primera vez que se pide
+y queda en una caché LRU cuyo límite es un presupuesto de memoria en bytes,
+no una cantidad de datasets: al pasarse del presupuesto se descartan los
+menos usados recientemente. Si varios requests piden a la vez un dataset
+que no está cargado, solo uno lo carga y los demás esperan ese resultado.
+También se recarga un dataset cuando sus archivos cambian en disco
+(revisado cada `check_interval` segundos).
+
+Un dataset puede crecer después de cargado (cachés derivadas que se llenan
+bajo demanda); `update_size` vuelve a medirlo y descarta otros si hace falta.
+
+Las cargas, recargas y descartes quedan registrados como métricas.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, Optional
+
+# Eventos recientes (cargas y descartes) que se reportan en las métricas
+MAX_EVENTS = 50
+
+
+class _Entry:
+    def __init__(self, value: Any, size: int):
+        self.value = value
+        self.size = size
+        self.loaded_at = time.time()
+        self.last_check = time.monotonic()
+        self.hits = 0
+
+
+class _PendingLoad:
+    """
+    Carga en curso de un dataset, compartida por los requests que lo esperan
+    """
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class DatasetRegistry:
+    """
+    Caché LRU de datasets limitada por memoria, con cargas coalescidas
+    """
+
+    def __init__(self, loader: Callable[[str], Any], size_of: Callable[[Any], int], memory_budget: int,
+                 is_stale: Optional[Callable[[Any], bool]] = None, check_interval: float = 2.0):
+        self.loader = loader
+        self.size_of = size_of
+        self.memory_budget = memory_budget
+        self.is_stale = is_stale
+        self.check_interval = check_interval
+
+        self._entries: 'OrderedDict[str, _Entry]' = OrderedDict()
+        self._pending: Dict[str, _PendingLoad] = {}
+        self._lock = threading.Lock()
+        self._memory_bytes = 0
+        self._counters = {
+            'hits': 0,
+            'loads': 0,
+            'reloads': 0,
+            'failed_loads': 0,
+            'coalesced_waits': 0,
+            'evictions': 0,
+            'load_seconds': 0.0,
+        }
+        self._events = deque(maxlen=MAX_EVENTS)
+
+    def get(self, name: str) -> Any:
+        """
+        Dataset `name`, cargándolo (o recargándolo si cambió) si hace falta
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and not self._needs_reload(entry):
+                entry.hits += 1
+                self._counters['hits'] += 1
+                self._entries.move_to_end(name)
+                return entry.value
+
+            pending = self._pending.get(name)
+            owner = pending is None
+            if owner:
+                pending = self._pending[name] = _PendingLoad()
+            else:
+                self._counters['coalesced_waits'] += 1
+
+        if not owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.value
+
+        start = time.perf_counter()
+        try:
+            value = self.loader(name)
+            size = self.size_of(value)
+        except BaseException as e:
+            with self._lock:
+                self._counters['failed_loads'] += 1
+                del self._pending[name]
+            pending.error = e
+            pending.done.set()
+            raise
+        seconds = time.perf_counter() - start
+
+        with self._lock:
+            previous = self._entries.pop(name, None)
+            if previous is not None:
+                self._memory_bytes -= previous.size
+            self._entries[name] = _Entry(value, size)
+            self._memory_bytes += size
+            self._counters['reloads' if previous is not None else 'loads'] += 1
+            self._counters['load_seconds'] += seconds
+            self._record('reload' if previous is not None else 'load', name, size, seconds)
+            self._evict(keep=name)
+            del self._pending[name]
+
+        pending.value = value
+        pending.done.set()
+        return value
+
+    def update_size(self, name: str, value: Any) -> None:
+        """
+        Vuelve a medir el dataset `name` (si `value` sigue siendo el cargado)
+        y respeta el presupuesto descartando los menos usados
+        """
+        size = self.size_of(value)
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None or entry.value is not value:
+                return
+            self._memory_bytes += size - entry.size
+            entry.size = size
+            self._evict(keep=name)
+
+    def _needs_reload(self, entry: _Entry) -> bool:
+        """
+        Revisa (como máximo cada `check_interval` segundos) si el dataset
+        cambió en disco
+        """
+        if self.is_stale is None or time.monotonic() - entry.last_check < self.check_interval:
+            return False
+        entry.last_check = time.monotonic()
+        return self.is_stale(entry.value)
+
+    def _evict(self, keep: str) -> None:
+        """
+        Descarta los datasets menos usados hasta respetar el presupuesto; el
+        recién cargado se conserva aunque por sí solo lo supere
+        """
+        while self._memory_bytes > self.memory_budget and len(self._entries) > 1:
+            name, entry = next(iter(self._entries.items()))
+            if name == keep:
+                self._entries.move_to_end(name)
+                continue
+            del self._entries[name]
+            self._memory_bytes -= entry.size
+            self._counters['evictions'] += 1
+            self._record('evict', name, entry.size)
+
+    def _record(self, event: str, name: str, size: int, seconds: Optional[float] = None) -> None:
+        record = {'event': event, 'dataset': name, 'bytes': size, 'time': round(time.time(), 3)}
+        if seconds is not None:
+            record['seconds'] = round(seconds, 4)
+        self._events.append(record)
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Datasets cargados, uso de memoria y contadores de cargas y descartes
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            counters['load_seconds'] = round(counters['load_seconds'], 4)
+            return {
+                'memory_budget_bytes': self.memory_budget,
+                'memory_bytes': self._memory_bytes,
+                'loading': sorted(self._pending),
+                'datasets': [
+                    {'name': name, 'bytes': entry.size, 'hits': entry.hits, 'loaded_at': round(entry.loaded_at, 3)}
+                    for name, entry in self._entries.items()
+                ],
+                **counters,
+                'events': list(self._events),
+            }
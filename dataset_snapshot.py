@@ -0,0 +1,883 @@
+"""
+Instantánea binaria de solo lectura del dataset de profesores.
+
+El servidor la construye una sola vez a partir de `profesores_completos.json`
+y la guarda en disco junto al JSON. Cada proceso la abre con mmap en modo de
+solo lectura, así que con un servidor WSGI de varios procesos las páginas se
+comparten a través del caché de páginas del sistema operativo en lugar de que
+cada proceso parsee el JSON y guarde su propia copia.
+
+Formato del archivo:
+    MAGIC (8 bytes) | longitud del encabezado (uint64) | encabezado JSON |
+    secciones binarias alineadas a SECTION_ALIGNMENT bytes
+
+El encabezado describe cada sección (offset, dtype, shape) y cómo se
+combinan en columnas, índices de grupos y payloads. Las columnas se
+codifican así:
+- 'int' / 'float': arreglo numérico (NaN para valores ausentes en 'float').
+- 'str': códigos int32 sobre una tabla de strings (diccionario).
+- 'str_list': listas estilo CSR, offsets + códigos sobre una tabla.
+- 'float_list': listas estilo CSR, offsets + valores float64.
+- 'json': cualquier otro valor, serializado en JSON y codificado como 'str'.
+Los valores nulos o ausentes se marcan en un arreglo opcional 'state'.
+"""
+import json
+import math
+import mmap
+import os
+import struct
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueo entre procesos
+    fcntl = None
+
+MAGIC = b'PROFSNP1'
+SECTION_ALIGNMENT = 64
+SNAPSHOT_SUFFIX = '.snapshot'
+FORMAT_VERSION = 2
+
+# Estado de cada valor de una columna
+PRESENT, NULL, ABSENT = 0, 1, 2
+
+# Modos de agrupación de /graph-data que se indexan y pre-serializan
+GROUP_MODES = ('interest_areas', 'specialization', 'community')
+
+# Versiones anteriores cuyos cambios se guardan en la instantánea para
+# responder /graph-data?since=<versión> con solo el delta
+MAX_HISTORY_VERSIONS = 16
+
+# Marca de campo ausente en un registro
+MISSING = object()
+
+
+def snapshot_path_for(json_path: str) -> str:
+    return json_path + SNAPSHOT_SUFFIX
+
+
+def source_signature(json_path: str) -> Optional[Dict[str, int]]:
+    """
+    Fecha de modificación y tamaño del JSON de origen (None si no existe)
+    """
+    try:
+        stat = os.stat(json_path)
+    except FileNotFoundError:
+        return None
+    return {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+
+
+# ---------------------------------------------------------------------------
+# Lectura del JSON
+# ---------------------------------------------------------------------------
+
+# Potencias de 10 que usa el parser JSON de pandas (ujson) para la parte decimal
+_UJSON_POW10 = [1.0, 0.1, 0.01, 0.001, 0.0001, 0.00001, 0.000001, 0.0000001, 0.00000001, 0.000000001,
+                0.0000000001, 0.00000000001, 0.000000000001, 0.0000000000001, 0.00000000000001,
+                0.000000000000001]
+_UJSON_MAX_DECIMALS = 15
+
+
+def _read_json_float(literal: str) -> float:
+    """
+    Convierte un número JSON a float igual que `pd.read_json` (ujson sin
+    `precise_float`), para que los valores servidos coincidan byte a byte
+    con los que servía el DataFrame (p. ej. 0.473 -> 0.47300000000000003)
+    """
+    mantissa, _, exponent = literal.lower().partition('e')
+    sign = -1.0 if mantissa.startswith('-') else 1.0
+    integer, _, fraction = mantissa.lstrip('-').partition('.')
+
+    fraction = fraction[:_UJSON_MAX_DECIMALS]
+    fraction_value = 0.0
+    for digit in fraction:
+        fraction_value = fraction_value * 10.0 + float(digit)
+    value = (float(int(integer)) + fraction_value * _UJSON_POW10[len(fraction)]) * sign
+
+    if exponent:
+        exponent_sign = -1.0 if exponent.startswith('-') else 1.0
+        exponent_value = 0.0
+        for digit in exponent.lstrip('+-'):
+            exponent_value = exponent_value * 10.0 + float(digit)
+        value *= 10.0 ** (exponent_value * exponent_sign)
+    return value
+
+
+def read_records(json_path: str) -> List[Dict[str, Any]]:
+    """
+    Lee los registros del JSON del dataset con la misma conversión numérica
+    que usaba el servidor con pandas
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return json.load(f, parse_float=_read_json_float)
+
+
+def _describe_source(source: str) -> Dict[str, Any]:
+    """
+    Firma del archivo de origen de la instantánea, incluyendo cuál de los
+    formatos se usó
+    """
+    return dict(source_signature(source), file=os.path.basename(source))
+
+
+def read_source_records(json_path: str) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, int]]]:
+    """
+    Lee los registros del archivo más reciente del dataset (JSON o columnar)
+    y retorna también su firma. Los floats del formato columnar pasan por la
+    misma conversión que los del JSON para que las respuestas no dependan del
+    formato de origen.
+    """
+    # Import local: columnar_dataset usa la codificación de este módulo
+    from columnar_dataset import COLUMNAR_SUFFIX, ColumnarDataset, dataset_source
+
+    source = dataset_source(json_path)
+    if source is None:
+        raise FileNotFoundError(json_path)
+    signature = _describe_source(source)
+
+    if not source.endswith(COLUMNAR_SUFFIX):
+        return read_records(source), signature
+
+    dataset = ColumnarDataset(source)
+    try:
+        records = dataset.records()
+    finally:
+        dataset.close()
+    return json.loads(json.dumps(records), parse_float=_read_json_float), signature
+
+
+# ---------------------------------------------------------------------------
+# Codificación de columnas
+# ---------------------------------------------------------------------------
+
+def encode_string_table(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Tabla de strings: bytes UTF-8 concatenados + offsets (n + 1)
+    """
+    encoded = [s.encode('utf-8') for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        offsets[1:] = np.cumsum([len(b) for b in encoded])
+    blob = np.frombuffer(b''.join(encoded), dtype=np.uint8) if encoded else np.zeros(0, dtype=np.uint8)
+    return blob, offsets
+
+
+class StringTable:
+    """
+    Vista de solo lectura sobre una tabla de strings; decodifica bajo demanda
+    """
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        return self._blob[start:end].tobytes().decode('utf-8')
+
+    def to_list(self) -> List[str]:
+        data = self._blob.tobytes()
+        offsets = self._offsets.tolist()
+        return [data[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+
+def _column_kind(values: List[Any]) -> str:
+    present = [v for v in values if v is not MISSING and v is not None]
+    if not present:
+        return 'json'
+    if all(isinstance(v, str) for v in present):
+        return 'str'
+    if all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        # Igual que pandas: un entero con valores ausentes pasa a float
+        return 'int' if len(present) == len(values) else 'float'
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return 'float'
+    if all(isinstance(v, list) for v in present):
+        items = [item for v in present for item in v]
+        if all(isinstance(item, str) for item in items):
+            return 'str_list'
+        if all(isinstance(item, float) for item in items):
+            return 'float_list'
+    return 'json'
+
+
+def encode_columns(records: List[Dict[str, Any]]) -> Tuple[Dict[str, Dict], Dict[str, np.ndarray]]:
+    """
+    Codifica los registros en columnas tipadas.
+
+    Retorna (descripción de columnas, arreglos por nombre de sección). Las
+    columnas siguen el orden de aparición de las claves en los registros.
+    """
+    names: List[str] = []
+    seen = set()
+    for record in records:
+        for key in record:
+            if key not in seen:
+                seen.add(key)
+                names.append(key)
+
+    columns: Dict[str, Dict] = {}
+    arrays: Dict[str, np.ndarray] = {}
+
+    for name in names:
+        values = [record.get(name, MISSING) for record in records]
+        kind = _column_kind(values)
+        prefix = f'col/{name}/'
+        spec = {'kind': kind, 'arrays': {}}
+
+        state = [ABSENT if v is MISSING else NULL if v is None else PRESENT for v in values]
+        if any(state):
+            arrays[prefix + 'state'] = np.array(state, dtype=np.int8)
+            spec['arrays']['state'] = prefix + 'state'
+
+        present = [None if v is MISSING else v for v in values]
+
+        if kind == 'int':
+            arrays[prefix + 'values'] = np.array(present, dtype=np.int64)
+            spec['arrays']['values'] = prefix + 'values'
+        elif kind == 'float':
+            arrays[prefix + 'values'] = np.array([math.nan if v is None else float(v) for v in present], dtype=np.float64)
+            spec['arrays']['values'] = prefix + 'values'
+            # Enteros con valores ausentes: se guardan como float pero se
+            # recuerdan como enteros para poder reconstruir el registro original
+            spec['integral'] = all(isinstance(v, int) for v in present if v is not None)
+        elif kind in ('str', 'json'):
+            if kind == 'json':
+                present = [None if v is None else json.dumps(v, ensure_ascii=False) for v in present]
+            table: Dict[str, int] = {}
+            codes = [-1 if v is None else table.setdefault(v, len(table)) for v in present]
+            arrays[prefix + 'codes'] = np.array(codes, dtype=np.int32)
+            arrays[prefix + 'table'], arrays[prefix + 'table_offsets'] = encode_string_table(list(table))
+            spec['arrays'].update(codes=prefix + 'codes', table=prefix + 'table', table_offsets=prefix + 'table_offsets')
+        else:
+            lengths = [len(v) if v is not None else 0 for v in present]
+            offsets = np.zeros(len(values) + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum(lengths)
+            items = [item for v in present if v is not None for item in v]
+            arrays[prefix + 'offsets'] = offsets
+            spec['arrays']['offsets'] = prefix + 'offsets'
+            if kind == 'str_list':
+                table = {}
+                arrays[prefix + 'values'] = np.array([table.setdefault(v, len(table)) for v in items], dtype=np.int32)
+                arrays[prefix + 'table'], arrays[prefix + 'table_offsets'] = encode_string_table(list(table))
+                spec['arrays'].update(table=prefix + 'table', table_offsets=prefix + 'table_offsets')
+            else:
+                arrays[prefix + 'values'] = np.array(items, dtype=np.float64)
+            spec['arrays']['values'] = prefix + 'values'
+
+        columns[name] = spec
+
+    return columns, arrays
+
+
+# ---------------------------------------------------------------------------
+# Índices de grupos y payloads de /graph-data
+# ---------------------------------------------------------------------------
+
+def group_members(records: List[Dict[str, Any]], group_by: str) -> Dict[Any, List[int]]:
+    """
+    Filas de cada grupo para un modo de agrupación, en el mismo orden en que
+    las arma /graph-data
+    """
+    groups: Dict[Any, List[int]] = {}
+    for row, professor in enumerate(records):
+        if group_by == 'interest_areas':
+            keys = professor.get('interest_areas') or []
+        elif group_by == 'specialization':
+            # Igual que los nodos: NaN si falta el campo, None si es nulo
+            keys = [professor.get('normalized_specialization', math.nan)]
+        elif group_by == 'community':
+            community = professor.get('community')
+            keys = [] if community is None else [f"Comunidad {int(community) + 1}"]
+        else:
+            keys = []
+        for key in keys:
+            groups.setdefault(key, []).append(row)
+    return groups
+
+
+def aggregate_groups(records: List[Dict[str, Any]], members: Dict[str, List[int]]) -> Dict[str, Any]:
+    """
+    Vista agregada (nivel de detalle por grupo) de un modo de agrupación: un
+    supernodo por grupo con su cantidad de miembros, el total de
+    `research_papers` y la cantidad de miembros por `degree_level`. Los
+    profesores sin grupo (o en un grupo sin nombre, como una especialización
+    nula) se resumen aparte en 'ungrouped'.
+    """
+    def summarize(rows: List[int]) -> Dict[str, Any]:
+        papers = 0
+        degree_mix: Dict[str, int] = {}
+        for row in rows:
+            professor = records[row]
+            value = professor.get('research_papers')
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and not math.isnan(value):
+                papers += value
+            degree = professor.get('degree_level')
+            if isinstance(degree, str):
+                degree_mix[degree] = degree_mix.get(degree, 0) + 1
+        if isinstance(papers, float) and papers.is_integer():
+            papers = int(papers)
+        return {"count": len(rows), "research_papers": papers, "degree_mix": degree_mix}
+
+    named = {name: rows for name, rows in members.items() if isinstance(name, str)}
+    return {
+        "lod": True,
+        "total": len(records),
+        "groups": [dict(summarize(rows), name=name) for name, rows in named.items()],
+        "ungrouped": summarize(ungrouped_rows(len(records), named.values()).tolist()),
+    }
+
+
+def ungrouped_rows(count: int, groups) -> np.ndarray:
+    """
+    Filas (de `count`) que no pertenecen a ninguno de los grupos dados
+    """
+    grouped = np.zeros(count, dtype=bool)
+    for rows in groups:
+        grouped[rows] = True
+    return np.flatnonzero(~grouped)
+
+
+def encode_payload(payload: Dict[str, Any]) -> bytes:
+    """
+    Serializa igual que `jsonify` de Flask fuera del modo debug
+    """
+    return (json.dumps(payload, ensure_ascii=True, sort_keys=True, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+# ---------------------------------------------------------------------------
+# Versiones y deltas
+# ---------------------------------------------------------------------------
+
+def _encode_node(node: Dict[str, Any]) -> str:
+    return json.dumps(node, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def diff_versions(old: Dict[str, Any], new: Dict[str, Any], version: int) -> Dict[str, Any]:
+    """
+    Cambios entre dos versiones del dataset. Cada versión es un dict con
+    'nodes' (registros con 'id'), 'groups' (modo -> {grupo: [ids]}) y
+    'modularity'.
+
+    Retorna {'version', 'added', 'modified', 'removed', 'groups', ['modularity']}
+    donde 'groups' indica, por modo, los miembros agregados y quitados de
+    cada grupo como pares [grupo, ids] (el nombre puede ser nulo, así que no
+    sirve como clave de un objeto JSON).
+    """
+    old_nodes = {node['id']: _encode_node(node) for node in old['nodes']}
+    new_ids = set()
+    added, modified = [], []
+    for node in new['nodes']:
+        new_ids.add(node['id'])
+        previous = old_nodes.get(node['id'])
+        if previous is None:
+            added.append(node)
+        elif previous != _encode_node(node):
+            modified.append(node)
+    removed = [node_id for node_id in old_nodes if node_id not in new_ids]
+
+    groups = {}
+    for mode in GROUP_MODES:
+        old_groups = old['groups'].get(mode, {})
+        new_groups = new['groups'].get(mode, {})
+        members_added, members_removed = [], []
+        for name in list(new_groups) + [name for name in old_groups if name not in new_groups]:
+            before, after = set(old_groups.get(name, [])), set(new_groups.get(name, []))
+            if after - before:
+                members_added.append([name, [m for m in new_groups.get(name, []) if m not in before]])
+            if before - after:
+                members_removed.append([name, [m for m in old_groups.get(name, []) if m not in after]])
+        groups[mode] = {'added': members_added, 'removed': members_removed}
+
+    delta = {'version': version, 'added': added, 'modified': modified, 'removed': removed, 'groups': groups}
+    if old.get('modularity') != new.get('modularity'):
+        delta['modularity'] = new.get('modularity')
+    return delta
+
+
+def compose_deltas(deltas: List[Dict[str, Any]], group_by: str) -> Dict[str, Any]:
+    """
+    Combina deltas consecutivos en uno solo para un modo de agrupación: un
+    nodo agregado y luego quitado desaparece, uno quitado y vuelto a agregar
+    queda como modificado, etc.
+    """
+    nodes: Dict[Any, Tuple[str, Optional[Dict[str, Any]]]] = {}
+    members: Dict[Tuple[str, Any], int] = {}
+    result: Dict[str, Any] = {}
+
+    for delta in deltas:
+        for node in delta['added']:
+            previous = nodes.get(node['id'])
+            nodes[node['id']] = ('modified' if previous else 'added', node)
+        for node in delta['modified']:
+            previous = nodes.get(node['id'])
+            nodes[node['id']] = ('added' if previous and previous[0] == 'added' else 'modified', node)
+        for node_id in delta['removed']:
+            previous = nodes.get(node_id)
+            if previous and previous[0] == 'added':
+                del nodes[node_id]
+            else:
+                nodes[node_id] = ('removed', None)
+
+        changes = delta['groups'].get(group_by, {})
+        for sign, key in ((1, 'added'), (-1, 'removed')):
+            pairs = changes.get(key, [])
+            # Historial de instantáneas anteriores: {grupo: ids}
+            if isinstance(pairs, dict):
+                pairs = pairs.items()
+            for name, ids in pairs:
+                # NaN leído del historial: una sola instancia para que sirva de clave
+                if isinstance(name, float) and math.isnan(name):
+                    name = math.nan
+                for node_id in ids:
+                    net = members.get((name, node_id), 0) + sign
+                    if net:
+                        members[(name, node_id)] = net
+                    else:
+                        members.pop((name, node_id), None)
+
+        if 'modularity' in delta and group_by == 'community':
+            result['modularity'] = delta['modularity']
+
+    result['added'] = [node for state, node in nodes.values() if state == 'added']
+    result['modified'] = [node for state, node in nodes.values() if state == 'modified']
+    result['removed'] = [node_id for node_id, (state, _) in nodes.items() if state == 'removed']
+
+    group_changes = {'added': {}, 'removed': {}}
+    for (name, node_id), net in members.items():
+        group_changes['added' if net > 0 else 'removed'].setdefault(name, []).append(node_id)
+    result['groups'] = {
+        key: [{"name": name, "members": ids} for name, ids in changes.items()]
+        for key, changes in group_changes.items()
+    }
+    return result
+
+
+def _previous_version(snapshot_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Estado de la instantánea existente (versión, historial, nodos y grupos)
+    para calcular el delta de la nueva; None si no hay una legible
+    """
+    try:
+        previous = DatasetSnapshot(snapshot_path)
+    except (ValueError, OSError, KeyError):
+        return None
+
+    nodes = previous.columns.records()
+    ids = [node.get('id') for node in nodes]
+    groups = {}
+    for mode in GROUP_MODES:
+        if mode not in previous.header.get('groups', {}):
+            continue
+        names, offsets, rows = previous.group_index(mode)
+        offsets, rows = offsets.tolist(), rows.tolist()
+        groups[mode] = {
+            name: [ids[row] for row in rows[offsets[i]:offsets[i + 1]]]
+            for i, name in enumerate(names)
+        }
+    return {
+        'version': previous.version,
+        'history': previous.history(),
+        'nodes': nodes,
+        'groups': groups,
+        'modularity': previous.header.get('modularity'),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Escritura y lectura
+# ---------------------------------------------------------------------------
+
+def _data_start(header_length: int) -> int:
+    return -(-(len(MAGIC) + 8 + header_length) // SECTION_ALIGNMENT) * SECTION_ALIGNMENT
+
+
+def _write_snapshot(path: str, header: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+    # Offsets de cada sección relativos al inicio de la zona de datos
+    sections = {}
+    position = 0
+    for name, array in arrays.items():
+        position = -(-position // SECTION_ALIGNMENT) * SECTION_ALIGNMENT
+        sections[name] = {'offset': position, 'dtype': array.dtype.str, 'shape': list(array.shape)}
+        position += array.nbytes
+
+    header_bytes = json.dumps(dict(header, sections=sections), ensure_ascii=False).encode('utf-8')
+    data_start = _data_start(len(header_bytes))
+
+    # Escribir en un archivo temporal y reemplazar de forma atómica, para que
+    # ningún proceso llegue a abrir una instantánea a medio escribir
+    temp_path = f"{path}.tmp{os.getpid()}"
+    with open(temp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('<Q', len(header_bytes)))
+        f.write(header_bytes)
+        for name, array in arrays.items():
+            f.seek(data_start + sections[name]['offset'])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(data_start + position)
+    os.replace(temp_path, path)
+
+
+def build_snapshot(json_path: str, snapshot_path: Optional[str] = None,
+                   metrics: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Construye la instantánea a partir del JSON del dataset (o de su versión
+    columnar, si es más reciente).
+
+    `metrics` son las métricas de red (graph_analytics.METRICS_FILE); la
+    modularidad se incluye en el payload del modo 'community'.
+    """
+    snapshot_path = snapshot_path or snapshot_path_for(json_path)
+    start = time.perf_counter()
+
+    records, signature = read_source_records(json_path)
+
+    # Igual que app.py: el nombre se usa como id
+    for record in records:
+        record['id'] = record.get('name')
+
+    columns, arrays = encode_columns(records)
+    reader = ColumnReader(columns, arrays, len(records))
+    nodes = reader.records()
+
+    modularity = (metrics or {}).get('community', {}).get('modularity')
+    ids = [node['id'] for node in nodes]
+    groups_header = {}
+    group_ids = {}
+    payloads = {}
+    aggregates = {}
+    for mode in GROUP_MODES:
+        members = group_members(records, mode)
+        group_ids[mode] = {name: [ids[row] for row in rows] for name, rows in members.items()}
+        group_names = list(members)
+        offsets = np.zeros(len(group_names) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(rows) for rows in members.values()])
+        prefix = f'group/{mode}/'
+        # Los grupos sin nombre (especialización nula o ausente) se guardan
+        # como '' con su estado aparte, igual que los valores de las columnas
+        arrays[prefix + 'names'], arrays[prefix + 'names_offsets'] = encode_string_table(
+            [name if isinstance(name, str) else '' for name in group_names])
+        arrays[prefix + 'names_state'] = np.array(
+            [PRESENT if isinstance(name, str) else NULL if name is None else ABSENT for name in group_names],
+            dtype=np.int8)
+        arrays[prefix + 'offsets'] = offsets
+        arrays[prefix + 'members'] = np.array([row for rows in members.values() for row in rows], dtype=np.int32)
+        groups_header[mode] = prefix
+
+        payload = {
+            "nodes": nodes,
+            "groups": [{"name": name, "members": group_ids[mode][name]} for name in members],
+        }
+        if mode == 'community':
+            payload["modularity"] = modularity
+        arrays[f'payload/{mode}'] = np.frombuffer(encode_payload(payload), dtype=np.uint8)
+        payloads[mode] = f'payload/{mode}'
+
+        # Vista agregada por grupo para los datasets grandes
+        aggregate = aggregate_groups(records, members)
+        if mode == 'community':
+            aggregate["modularity"] = modularity
+        arrays[f'aggregate/{mode}'] = np.frombuffer(encode_payload(aggregate), dtype=np.uint8)
+        aggregates[mode] = f'aggregate/{mode}'
+
+    # Nueva versión: el delta respecto de la instantánea anterior se calcula
+    # aquí, una sola vez, y se agrega al historial acotado
+    version, history = 1, []
+    previous = _previous_version(snapshot_path)
+    if previous is not None:
+        version = previous['version'] + 1
+        current = {'nodes': nodes, 'groups': group_ids, 'modularity': modularity}
+        history = (previous['history'] + [diff_versions(previous, current, version)])[-MAX_HISTORY_VERSIONS:]
+    arrays['history'] = np.frombuffer(json.dumps(history, ensure_ascii=False).encode('utf-8'), dtype=np.uint8)
+
+    header = {
+        'format': FORMAT_VERSION,
+        'version': version,
+        'modularity': modularity,
+        'source': signature,
+        'count': len(records),
+        'columns': columns,
+        'groups': groups_header,
+        'payloads': payloads,
+        'aggregates': aggregates,
+        'built_at': time.time(),
+    }
+    _write_snapshot(snapshot_path, header, arrays)
+    print(f"Instantánea del dataset construida en {time.perf_counter() - start:.2f}s: {snapshot_path}")
+    return snapshot_path
+
+
+class ColumnReader:
+    """
+    Decodifica columnas codificadas por `encode_columns`, ya sea desde
+    arreglos en memoria o desde vistas mmap de una instantánea
+    """
+
+    def __init__(self, columns: Dict[str, Dict], arrays, count: int):
+        self.columns = columns
+        self._arrays = arrays
+        self.count = count
+        self._tables: Dict[str, StringTable] = {}
+
+    def array(self, column: str, role: str) -> Optional[np.ndarray]:
+        section = self.columns[column]['arrays'].get(role)
+        return None if section is None else self._arrays[section]
+
+    def table(self, column: str) -> StringTable:
+        if column not in self._tables:
+            self._tables[column] = StringTable(self.array(column, 'table'), self.array(column, 'table_offsets'))
+        return self._tables[column]
+
+    def values(self, column: str, rows: Optional[np.ndarray] = None) -> List[Any]:
+        """
+        Valores de la columna como objetos de Python, con la misma semántica
+        que un DataFrame de pandas leído con `read_json`: NaN para valores
+        ausentes (y para nulos en columnas numéricas), None para nulos. Con
+        `rows` solo se decodifican esas filas.
+        """
+        spec = self.columns[column]
+        kind = spec['kind']
+        state = self.array(column, 'state')
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+            if state is not None:
+                state = state[rows]
+
+        if kind in ('int', 'float'):
+            values = self.array(column, 'values')
+            return (values if rows is None else values[rows]).tolist()
+
+        if kind in ('str', 'json'):
+            table = self.table(column).to_list()
+            if kind == 'json':
+                table = [json.loads(value) for value in table]
+            codes = self.array(column, 'codes')
+            if rows is not None:
+                codes = codes[rows]
+            result = [table[code] if code >= 0 else None for code in codes.tolist()]
+        else:
+            offsets = self.array(column, 'offsets')
+            items = self.array(column, 'values')
+            if rows is not None:
+                starts, ends = offsets[rows], offsets[rows + 1]
+                items = np.concatenate([items[start:end] for start, end in zip(starts.tolist(), ends.tolist())] or [items[:0]])
+                offsets = np.concatenate([[0], np.cumsum(ends - starts)])
+            offsets = offsets.tolist()
+            items = items.tolist()
+            if kind == 'str_list':
+                table = self.table(column).to_list()
+                items = [table[code] for code in items]
+            result = [items[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+            if state is not None:
+                result = [value if s == PRESENT else None for value, s in zip(result, state.tolist())]
+
+        if state is not None:
+            result = [math.nan if s == ABSENT else value for value, s in zip(result, state.tolist())]
+        return result
+
+    def records(self, rows: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Registros completos (equivalente a `DataFrame.to_dict('records')`),
+        solo de las filas `rows` si se indican
+        """
+        names = list(self.columns)
+        decoded = [self.values(name, rows) for name in names]
+        count = self.count if rows is None else len(rows)
+        return [dict(zip(names, row)) for row in zip(*decoded)] if names else [{} for _ in range(count)]
+
+    def plain_values(self, column: str) -> List[Any]:
+        """
+        Valores de la columna tal como estaban en los registros originales:
+        None para nulos y `MISSING` para campos ausentes
+        """
+        spec = self.columns[column]
+        values = self.values(column)
+        if spec['kind'] == 'float' and spec.get('integral'):
+            values = [v if math.isnan(v) else int(v) for v in values]
+
+        state = self.array(column, 'state')
+        if state is None:
+            return values
+        return [v if s == PRESENT else None if s == NULL else MISSING for v, s in zip(values, state.tolist())]
+
+    def plain_records(self, columns: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Registros originales (sin los campos ausentes), solo con `columns` si se indica
+        """
+        names = [name for name in self.columns if columns is None or name in columns]
+        decoded = [self.plain_values(name) for name in names]
+        records = [{} for _ in range(self.count)]
+        for name, values in zip(names, decoded):
+            for record, value in zip(records, values):
+                if value is not MISSING:
+                    record[name] = value
+        return records
+
+
+class DatasetSnapshot:
+    """
+    Instantánea abierta con mmap de solo lectura
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"'{path}' no es una instantánea del dataset")
+        (header_length,) = struct.unpack_from('<Q', self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        self.header = json.loads(self._mmap[header_start:header_start + header_length].decode('utf-8'))
+
+        data_start = _data_start(header_length)
+        self._sections = {}
+        for name, section in self.header['sections'].items():
+            dtype = np.dtype(section['dtype'])
+            count = int(np.prod(section['shape'])) if section['shape'] else 1
+            view = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=data_start + section['offset'])
+            self._sections[name] = view.reshape(section['shape'])
+
+        self.count = self.header['count']
+        self.columns = ColumnReader(self.header['columns'], self._sections, self.count)
+        self._history: Optional[List[Dict[str, Any]]] = None
+
+    @property
+    def source(self) -> Optional[Dict[str, int]]:
+        return self.header.get('source')
+
+    @property
+    def version(self) -> int:
+        return self.header.get('version', 1)
+
+    def section(self, name: str) -> np.ndarray:
+        return self._sections[name]
+
+    def history(self) -> List[Dict[str, Any]]:
+        """
+        Deltas de las últimas versiones (el más antiguo primero)
+        """
+        if self._history is None:
+            section = self._sections.get('history')
+            self._history = [] if section is None else json.loads(section.tobytes().decode('utf-8'))
+        return self._history
+
+    def delta_since(self, since: int, group_by: str) -> Optional[Dict[str, Any]]:
+        """
+        Cambios desde la versión `since` hasta la actual para un modo de
+        agrupación, o None si el historial no llega hasta esa versión
+        """
+        if since > self.version or since < 1:
+            return None
+        deltas = [delta for delta in self.history() if delta['version'] > since]
+        if [delta['version'] for delta in deltas] != list(range(since + 1, self.version + 1)):
+            return None
+        return dict(compose_deltas(deltas, group_by), delta=True, since=since, version=self.version)
+
+    def payload(self, group_by: str) -> Optional[memoryview]:
+        """
+        Respuesta de /graph-data ya serializada para un modo de agrupación
+        """
+        section = self.header['payloads'].get(group_by)
+        return None if section is None else memoryview(self._sections[section])
+
+    def aggregate_payload(self, group_by: str) -> Optional[memoryview]:
+        """
+        Vista agregada de /graph-data (un supernodo por grupo) ya serializada
+        """
+        section = self.header.get('aggregates', {}).get(group_by)
+        return None if section is None else memoryview(self._sections[section])
+
+    def group_rows(self, group_by: str, name: str) -> Optional[np.ndarray]:
+        """
+        Filas de los miembros de un grupo (None si el modo o el grupo no existen)
+        """
+        if group_by not in self.header['groups']:
+            return None
+        names, offsets, rows = self.group_index(group_by)
+        try:
+            index = names.index(name)
+        except ValueError:
+            return None
+        return rows[offsets[index]:offsets[index + 1]]
+
+    def ungrouped_rows(self, group_by: str) -> Optional[np.ndarray]:
+        """
+        Filas que no están en ningún grupo con nombre, las del supernodo
+        'ungrouped' de la vista agregada (None si el modo no existe)
+        """
+        if group_by not in self.header['groups']:
+            return None
+        names, offsets, rows = self.group_index(group_by)
+        return ungrouped_rows(self.count, (rows[offsets[i]:offsets[i + 1]]
+                                           for i, name in enumerate(names) if isinstance(name, str)))
+
+    def group_index(self, group_by: str) -> Tuple[List[Optional[str]], np.ndarray, np.ndarray]:
+        """
+        (nombres de grupo, offsets, filas de los miembros) de un modo
+        """
+        prefix = self.header['groups'][group_by]
+        names: List[Optional[str]] = StringTable(
+            self._sections[prefix + 'names'], self._sections[prefix + 'names_offsets']).to_list()
+        if prefix + 'names_state' in self._sections:
+            for index, state in enumerate(self._sections[prefix + 'names_state'].tolist()):
+                if state != PRESENT:
+                    names[index] = None if state == NULL else math.nan
+        return names, self._sections[prefix + 'offsets'], self._sections[prefix + 'members']
+
+
+def current_source_signature(json_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Firma del archivo de origen actual del dataset (None si no existe); si
+    difiere de `DatasetSnapshot.source`, la instantánea está desactualizada
+    """
+    from columnar_dataset import dataset_source
+
+    source = dataset_source(json_path)
+    return None if source is None else _describe_source(source)
+
+
+def load_snapshot(json_path: str, metrics: Optional[Dict[str, Any]] = None) -> Optional[DatasetSnapshot]:
+    """
+    Abre la instantánea del dataset, construyéndola antes si no existe o si el
+    archivo de origen (JSON o columnar, el más reciente) cambió. Entre procesos se usa un bloqueo de archivo para que solo uno
+    la construya y los demás esperen y la abran.
+    """
+    if current_source_signature(json_path) is None:
+        return None
+
+    snapshot_path = snapshot_path_for(json_path)
+
+    def open_if_fresh():
+        if not os.path.exists(snapshot_path):
+            return None
+        try:
+            snapshot = DatasetSnapshot(snapshot_path)
+        except (ValueError, OSError):
+            return None
+        if snapshot.header.get('format') != FORMAT_VERSION or snapshot.source != current_source_signature(json_path):
+            return None
+        return snapshot
+
+    snapshot = open_if_fresh()
+    if snapshot is not None:
+        return snapshot
+
+    with open(snapshot_path + '.lock', 'w') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            snapshot = open_if_fresh()
+            if snapshot is None:
+                build_snapshot(json_path, snapshot_path, metrics)
+                snapshot = DatasetSnapshot(snapshot_path)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    return snapshot
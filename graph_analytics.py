@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from co_interest import build_interest_matrix, co_interest_edges
+from columnar_dataset import load_professors, save_professors
+
+# networkx y python-louvain se importan dentro de las funciones de análisis:
+# el servidor web solo usa `load_network_metrics`
+if TYPE_CHECKING:
+    import networkx as nx
+
+# Parámetros de la red de co-interés usada para el análisis
+NETWORK_TOP_K = 10
+NETWORK_MIN_WEIGHT = 0.1
+LOUVAIN_RESOLUTION = 1.0
+LOUVAIN_RANDOM_STATE = 42
+
+# Intermediación exacta hasta este tamaño de componente; en componentes más
+# grandes se estima con BETWEENNESS_SAMPLES nodos fuente aleatorios
+EXACT_BETWEENNESS_MAX_NODES = 500
+BETWEENNESS_SAMPLES = 256
+PAGERANK_ALPHA = 0.85
+
+METRICS_FILE = 'metricas_red.json'
+
+def build_co_interest_graph(professors_data: List[Dict[str, Any]]) -> 'nx.Graph':
+    """
+    Construye el grafo ponderado de co-interés (nodos = nombres de profesores)
+    """
+    import networkx as nx
+
+    matrix, _ = build_interest_matrix(
+        [p.get('interest_areas') for p in professors_data],
+        [p.get('interest_scores') for p in professors_data],
+    )
+    sources, targets, weights = co_interest_edges(matrix, NETWORK_TOP_K, NETWORK_MIN_WEIGHT)
+
+    names = [p['name'] for p in professors_data]
+    graph = nx.Graph()
+    graph.add_nodes_from(names)
+    graph.add_edges_from(
+        (names[s], names[t], {'weight': float(w), 'distance': 1.0 / float(w)})
+        for s, t, w in zip(sources.tolist(), targets.tolist(), weights.tolist())
+    )
+    return graph
+
+def detect_communities(graph: 'nx.Graph') -> Tuple[Dict[str, Optional[int]], float]:
+    """
+    Detecta comunidades con Louvain sobre el grafo ponderado.
+
+    Las comunidades se numeran de mayor a menor tamaño. Los profesores sin
+    aristas no forman parte de ninguna comunidad (valor None).
+    Retorna (partición, modularidad).
+    """
+    import community as community_louvain
+
+    connected = graph.subgraph([n for n in graph.nodes if graph.degree(n) > 0])
+    if connected.number_of_edges() == 0:
+        return {name: None for name in graph.nodes}, 0.0
+
+    partition = community_louvain.best_partition(
+        connected, weight='weight', resolution=LOUVAIN_RESOLUTION, random_state=LOUVAIN_RANDOM_STATE
+    )
+    modularity = community_louvain.modularity(partition, connected, weight='weight')
+
+    # Renumerar por tamaño para que las etiquetas sean estables y legibles
+    sizes = Counter(partition.values())
+    ranking = {label: rank for rank, (label, _) in enumerate(sorted(sizes.items(), key=lambda x: (-x[1], x[0])))}
+
+    result = {name: None for name in graph.nodes}
+    for name, label in partition.items():
+        result[name] = ranking[label]
+    return result, modularity
+
+def _component_signature(graph: 'nx.Graph', members) -> str:
+    """
+    Huella de un componente conexo: sus miembros y sus aristas con peso.
+    Si no cambia, sus métricas de centralidad tampoco.
+    """
+    digest = hashlib.sha1()
+    for name in sorted(members):
+        digest.update(name.encode('utf-8') + b'\0')
+    edges = sorted(tuple(sorted((u, v))) + (round(d['weight'], 6),) for u, v, d in graph.subgraph(members).edges(data=True))
+    for u, v, w in edges:
+        digest.update(f"{u}\0{v}\0{w}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+def _component_centrality(component: 'nx.Graph') -> Dict[str, Dict[str, float]]:
+    """
+    PageRank local (suma 1 dentro del componente) y betweenness sin
+    normalizar de un componente conexo. El PageRank de un nodo aislado no
+    depende del componente y se calcula en `compute_centrality`.
+    """
+    import networkx as nx
+
+    size = component.number_of_nodes()
+    if size == 1:
+        name = next(iter(component.nodes))
+        return {'pagerank': {name: 1.0}, 'betweenness': {name: 0.0}}
+
+    pagerank = nx.pagerank(component, alpha=PAGERANK_ALPHA, weight='weight')
+    samples = None if size <= EXACT_BETWEENNESS_MAX_NODES else BETWEENNESS_SAMPLES
+    betweenness = nx.betweenness_centrality(
+        component, k=samples, normalized=False, weight='distance', seed=LOUVAIN_RANDOM_STATE
+    )
+    return {'pagerank': pagerank, 'betweenness': betweenness}
+
+def compute_centrality(graph: 'nx.Graph', previous: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Dict[str, float]], Dict[str, Any], int]:
+    """
+    Calcula PageRank y betweenness (aproximada por muestreo en componentes
+    grandes) componente por componente.
+
+    `previous` es el estado guardado en la ejecución anterior: los
+    componentes cuya huella no cambió reutilizan sus valores y solo se
+    recalculan los afectados. La betweenness se normaliza con el total de
+    nodos.
+
+    El PageRank coincide con el del grafo completo: los profesores aislados
+    son los únicos nodos sin aristas (colgantes) y su masa se reparte
+    uniformemente, así que cada nodo recibe el mismo término de
+    teletransporte c = (1 - α) / (n - α·|aislados|). Un aislado vale
+    exactamente c, y el PageRank local (suma 1) de un componente de m nodos
+    se escala por m / (n - α·|aislados|).
+
+    Retorna (métricas por profesor, estado para la próxima ejecución,
+    número de componentes recalculados).
+    """
+    import networkx as nx
+
+    cached = (previous or {}).get('components', {})
+    n_nodes = graph.number_of_nodes()
+    betweenness_scale = 2.0 / ((n_nodes - 1) * (n_nodes - 2)) if n_nodes > 2 else 0.0
+    isolated = sum(1 for node in graph.nodes if graph.degree(node) == 0)
+    pagerank_norm = n_nodes - PAGERANK_ALPHA * isolated
+
+    metrics = {'pagerank': {}, 'betweenness': {}}
+    state = {'components': {}}
+    recomputed = 0
+
+    for members in nx.connected_components(graph):
+        signature = _component_signature(graph, members)
+        local = cached.get(signature)
+        if local is None:
+            local = _component_centrality(graph.subgraph(members))
+            recomputed += 1
+        state['components'][signature] = local
+
+        for name in members:
+            if len(members) == 1:
+                metrics['pagerank'][name] = (1 - PAGERANK_ALPHA) / pagerank_norm
+            else:
+                metrics['pagerank'][name] = local['pagerank'][name] * len(members) / pagerank_norm
+            metrics['betweenness'][name] = local['betweenness'][name] * betweenness_scale
+
+    return metrics, state, recomputed
+
+def load_network_metrics(path: str = METRICS_FILE) -> Dict[str, Any]:
+    """
+    Carga las métricas de red guardadas junto al dataset (vacío si no existen)
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def main():
+    """
+    Calcula comunidades y centralidad de la red de co-interés y las guarda con
+    el dataset.
+
+    Debe ejecutarse al final del pipeline (después de clean_data.py): agrega
+    los campos 'community', 'pagerank' y 'betweenness' a cada profesor y
+    guarda la modularidad y el estado de la centralidad en METRICS_FILE.
+    """
+    input_file = 'profesores_completos.json'
+
+    try:
+        print("🕸️ Iniciando análisis de la red de co-interés...")
+
+        professors_data = load_professors(input_file)
+
+        print(f"📊 Procesando {len(professors_data)} profesores...")
+
+        graph = build_co_interest_graph(professors_data)
+        print(f"Grafo: {graph.number_of_nodes()} nodos, {graph.number_of_edges()} aristas")
+
+        partition, modularity = detect_communities(graph)
+        for professor in professors_data:
+            professor['community'] = partition.get(professor['name'])
+
+        communities = Counter(c for c in partition.values() if c is not None)
+        print(f"\n=== 🧩 COMUNIDADES ({len(communities)}) ===")
+        print(f"Modularidad: {modularity:.4f}")
+        for label, count in sorted(communities.items()):
+            print(f"Comunidad {label + 1}: {count} profesores")
+
+        # Centralidad: solo se recalculan los componentes que cambiaron
+        metrics = load_network_metrics()
+        centrality, centrality_state, recomputed = compute_centrality(graph, metrics.get('centrality'))
+        for professor in professors_data:
+            professor['pagerank'] = round(centrality['pagerank'][professor['name']], 8)
+            professor['betweenness'] = round(centrality['betweenness'][professor['name']], 8)
+
+        total_components = len(centrality_state['components'])
+        print("\n=== 📈 CENTRALIDAD ===")
+        print(f"Componentes recalculados: {recomputed}/{total_components}")
+        top = sorted(professors_data, key=lambda p: p['pagerank'], reverse=True)[:5]
+        for professor in top:
+            print(f"{professor['name']}: PageRank {professor['pagerank']:.5f}, betweenness {professor['betweenness']:.5f}")
+
+        metrics['centrality'] = centrality_state
+        metrics['community'] = {
+            'modularity': modularity,
+            'communities': len(communities),
+            'resolution': LOUVAIN_RESOLUTION,
+            'top_k': NETWORK_TOP_K,
+            'min_weight': NETWORK_MIN_WEIGHT,
+        }
+        # Las métricas se escriben antes que el dataset: el servidor recarga
+        # cuando cambia el dataset, y para entonces la modularidad ya es la nueva
+        temp_path = f"{METRICS_FILE}.tmp{os.getpid()}"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(metrics, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, METRICS_FILE)
+
+        written = save_professors(professors_data, input_file)
+
+        print(f"\n✅ Comunidades y centralidad guardadas en: {', '.join(written)}")
+        print(f"📁 Métricas de red guardadas en: {METRICS_FILE}")
+
+    except FileNotFoundError:
+        print(f"❌ Error: No se encontró el archivo '{input_file}'")
+    except json.JSONDecodeError:
+        print("❌ Error: El archivo JSON no es válido")
+    except Exception as e:
+        print(f"❌ Error inesperado: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Prueba de carga local del servidor (app.py).
+
+Genera un `profesores_completos.json` sintético del tamaño pedido en un
+directorio temporal, levanta el servidor sobre él (como subproceso, o dentro
+de este mismo proceso compartiendo el GIL con los clientes) y lo somete a
+varios clientes concurrentes que repiten una mezcla ponderada de requests:
+/graph-data en cada modo de `groupBy` y, según la mezcla, /search y
+/co-interest. Para cada tamaño y cantidad de clientes reporta requests por
+segundo, latencias p50/p95/p99 y bytes transferidos, en total y por tipo de
+request.
+
+Los resultados se guardan en un JSON con claves ordenadas para poder
+compararlos entre commits (incluye el commit de git si está disponible).
+
+Uso: python load_test.py [--sizes 1000,5000] [--clients 1,4,16]
+                         [--duration 10] [--mix graph|mixed]
+                         [--mode subprocess|inprocess] [--output archivo.json]
+"""
+import argparse
+import http.client
+import importlib
+import json
+import logging
+import math
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+DATA_FILE = 'profesores_completos.json'
+OUTPUT_PATH = 'load_test_results.json'
+
+DEFAULT_SIZES = (1000, 5000)
+DEFAULT_CLIENTS = (1, 4, 16)
+DEFAULT_DURATION = 10.0
+STARTUP_TIMEOUT = 120.0
+REQUEST_TIMEOUT = 60.0
+SEED = 0
+
+# Mezclas de requests: nombre -> (ruta, peso). '{name}' se reemplaza por el
+# prefijo de un nombre del dataset.
+REQUEST_MIXES: Dict[str, Dict[str, Tuple[str, int]]] = {
+    'graph': {
+        'graph-interest_areas': ('/graph-data?groupBy=interest_areas', 1),
+        'graph-specialization': ('/graph-data?groupBy=specialization', 1),
+        'graph-community': ('/graph-data?groupBy=community', 1),
+    },
+    'mixed': {
+        'graph-interest_areas': ('/graph-data?groupBy=interest_areas', 3),
+        'graph-specialization': ('/graph-data?groupBy=specialization', 2),
+        'graph-community': ('/graph-data?groupBy=community', 1),
+        'search': ('/search?q={name}&limit=10', 3),
+        'co-interest': ('/co-interest?k=10', 1),
+    },
+}
+
+_FIRST_NAMES = ["Juan", "María", "José", "Ana", "Luis", "Carmen", "Pedro", "Lucía", "Jorge", "Rosa",
+                "Carlos", "Elena", "Miguel", "Sofía", "Andrés", "Valeria", "Raúl", "Patricia", "Diego", "Gabriela"]
+_LAST_NAMES = ["Pérez", "García", "Rodríguez", "López", "Martínez", "Sánchez", "Ramírez", "Torres", "Flores",
+               "Rivera", "Gómez", "Díaz", "Vargas", "Castro", "Rojas", "Mendoza", "Quispe", "Huamán", "Chávez"]
+_AREAS = ["Inteligencia Artificial", "Robótica", "Energía Renovable", "Bioingeniería", "Ciencia de Datos",
+          "Materiales", "Matemática Aplicada", "Física Cuántica", "Gestión", "Educación"]
+_SPECIALIZATIONS = ["Computer Science", "Mechanical Engineering", "Physics", "Mathematics",
+                    "Civil Engineering", "Education"]
+_UNIVERSITIES = ["PUCP", "UTEC", "UNI Peru", "UNAM", "UC Berkeley", "University of Oxford"]
+_DEGREES = ["PhD", "Master", "Bachelor"]
+_COMMUNITIES = 12
+
+
+def generate_dataset(count: int, path: str, seed: int = SEED) -> List[str]:
+    """
+    Escribe un dataset sintético con las columnas que usa el servidor y
+    retorna los nombres de los profesores
+    """
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        areas = rng.sample(_AREAS, rng.randint(0, 3))
+        records.append({
+            'name': f"{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)} {rng.choice(_LAST_NAMES)} {i}",
+            'research_papers': rng.randint(0, 30),
+            'interest_areas': areas,
+            'interest_scores': sorted((round(rng.uniform(0.3, 0.99), 3) for _ in areas), reverse=True),
+            'degree_level': rng.choice(_DEGREES),
+            'normalized_specialization': rng.choice(_SPECIALIZATIONS),
+            'normalized_university': rng.choice(_UNIVERSITIES),
+            'community': rng.randrange(_COMMUNITIES),
+            'url_image': f"https://example.org/img/{i}.jpg",
+        })
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False, indent=2)
+    return [record['name'] for record in records]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _get(port: int, path: str) -> Tuple[int, int]:
+    """
+    GET a la ruta; retorna (status, bytes del cuerpo)
+    """
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=REQUEST_TIMEOUT)
+    try:
+        connection.request('GET', path)
+        response = connection.getresponse()
+        return response.status, len(response.read())
+    finally:
+        connection.close()
+
+
+def _wait_until_ready(port: int, process: Optional[subprocess.Popen] = None) -> float:
+    """
+    Espera a que el servidor responda y retorna cuánto tardó
+    """
+    start = time.perf_counter()
+    while time.perf_counter() - start < STARTUP_TIMEOUT:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"El servidor terminó con código {process.returncode}")
+        try:
+            if _get(port, '/search?q=a')[0] == 200:
+                return time.perf_counter() - start
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"El servidor no respondió en {STARTUP_TIMEOUT:.0f}s")
+
+
+class Server:
+    """
+    Servidor de app.py sobre el dataset de `workdir`, como subproceso o en
+    un hilo de este proceso
+    """
+
+    def __init__(self, workdir: str, mode: str = 'subprocess'):
+        self.workdir = workdir
+        self.mode = mode
+        self.port = _free_port()
+        self._process: Optional[subprocess.Popen] = None
+        self._server = None
+        self._previous_cwd = os.getcwd()
+
+    def start(self) -> float:
+        root = os.path.dirname(os.path.abspath(__file__))
+        if self.mode == 'subprocess':
+            code = (f"import sys; sys.path.insert(0, {root!r}); import app; "
+                    f"app.app.run(host='127.0.0.1', port={self.port}, threaded=True)")
+            self._process = subprocess.Popen([sys.executable, '-c', code], cwd=self.workdir,
+                                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            return _wait_until_ready(self.port, self._process)
+
+        from werkzeug.serving import make_server
+
+        # app.py lee el dataset del directorio actual al importarse
+        if root not in sys.path:
+            sys.path.insert(0, root)
+        os.chdir(self.workdir)
+        # Sin el log de cada request
+        logging.getLogger('werkzeug').setLevel(logging.ERROR)
+        module = importlib.reload(sys.modules['app']) if 'app' in sys.modules else importlib.import_module('app')
+        self._server = make_server('127.0.0.1', self.port, module.app, threaded=True)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return _wait_until_ready(self.port)
+
+    def stop(self) -> None:
+        if self._process is not None:
+            self._process.terminate()
+            self._process.wait()
+        if self._server is not None:
+            self._server.shutdown()
+            os.chdir(self._previous_cwd)
+
+
+def _percentile(sorted_values: Sequence[float], q: float) -> float:
+    """
+    Percentil por rango más cercano de una lista ordenada
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _summarize(samples: List[Tuple[str, float, int, int]], elapsed: float) -> Dict:
+    """
+    Requests por segundo, latencias (ms) y bytes de un conjunto de muestras
+    (nombre, latencia, status, bytes)
+    """
+    latencies = sorted(latency * 1000 for _, latency, _, _ in samples)
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for _, _, status, _ in samples if status != 200),
+        'rps': round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(_percentile(latencies, 50), 2),
+            'p95': round(_percentile(latencies, 95), 2),
+            'p99': round(_percentile(latencies, 99), 2),
+            'max': round(latencies[-1], 2) if latencies else 0.0,
+        },
+        'bytes': sum(size for _, _, _, size in samples),
+    }
+
+
+def run_clients(port: int, clients: int, duration: float, mix: Dict[str, Tuple[str, int]],
+                names: Sequence[str], seed: int = SEED) -> Dict:
+    """
+    Ejecuta `clients` clientes concurrentes durante `duration` segundos
+    """
+    request_names = list(mix)
+    weights = [mix[name][1] for name in request_names]
+    samples: List[Tuple[str, float, int, int]] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(index: int):
+        rng = random.Random(seed * 1000 + index)
+        local = []
+        while time.perf_counter() < deadline:
+            name = rng.choices(request_names, weights)[0]
+            path = mix[name][0].replace('{name}', quote(rng.choice(names).split()[0][:4]))
+            start = time.perf_counter()
+            try:
+                status, size = _get(port, path)
+            except OSError:
+                status, size = 0, 0
+            local.append((name, time.perf_counter() - start, status, size))
+        with lock:
+            samples.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    result = _summarize(samples, elapsed)
+    result['by_request'] = {
+        name: _summarize([sample for sample in samples if sample[0] == name], elapsed)
+        for name in request_names
+    }
+    return result
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)),
+                              check=True, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(',') if item]
+
+
+def main():
+    """
+    Ejecuta la prueba de carga para cada tamaño de dataset y cantidad de clientes
+    """
+    parser = argparse.ArgumentParser(description="Prueba de carga local del servidor")
+    parser.add_argument('--sizes', type=_int_list, default=list(DEFAULT_SIZES))
+    parser.add_argument('--clients', type=_int_list, default=list(DEFAULT_CLIENTS))
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION)
+    parser.add_argument('--mix', choices=sorted(REQUEST_MIXES), default='mixed')
+    parser.add_argument('--mode', choices=('subprocess', 'inprocess'), default='subprocess')
+    parser.add_argument('--output', default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    mix = REQUEST_MIXES[args.mix]
+    output_path = os.path.abspath(args.output)
+    report = {
+        'commit': _git_commit(),
+        'config': {'sizes': args.sizes, 'clients': args.clients, 'duration': args.duration,
+                   'mix': {name: {'path': path, 'weight': weight} for name, (path, weight) in mix.items()},
+                   'mode': args.mode},
+        'results': [],
+    }
+
+    print(f"🚀 Prueba de carga: tamaños {args.sizes}, clientes {args.clients}, {args.duration:.0f}s por escenario")
+    try:
+        for size in args.sizes:
+            workdir = tempfile.mkdtemp(prefix='load_test_')
+            server = None
+            try:
+                names = generate_dataset(size, os.path.join(workdir, DATA_FILE))
+                server = Server(workdir, args.mode)
+                startup = server.start()
+                print(f"\n📊 {size} profesores (servidor listo en {startup:.1f}s)")
+
+                # Una vuelta por cada tipo de request antes de medir
+                for name, (path, _) in mix.items():
+                    _get(server.port, path.replace('{name}', quote(names[0][:4])))
+
+                for clients in args.clients:
+                    result = run_clients(server.port, clients, args.duration, mix, names)
+                    result.update({'size': size, 'clients': clients, 'startup_seconds': round(startup, 2)})
+                    report['results'].append(result)
+                    latency = result['latency_ms']
+                    print(f"  {clients:>3} clientes: {result['rps']} req/s, p50 {latency['p50']} ms, "
+                          f"p95 {latency['p95']} ms, p99 {latency['p99']} ms, "
+                          f"{result['bytes'] / 1024 / 1024:.1f} MB, {result['errors']} errores")
+            finally:
+                if server is not None:
+                    server.stop()
+                shutil.rmtree(workdir, ignore_errors=True)
+    except Exception as e:
+        print(f"❌ Error inesperado: {e}")
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+    print(f"\n✅ Resultados guardados en: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
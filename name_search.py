@@ -0,0 +1,329 @@
+"""
+Índice de búsqueda de nombres de profesores.
+
+Se construye una sola vez al cargar los datos y combina dos estructuras:
+- Un trie de prefijos para autocompletado (sobre el nombre completo y sobre
+  cada palabra del nombre, de modo que "perez" encuentra "Juan Pérez").
+- Un índice invertido de trigramas de caracteres para búsquedas tolerantes
+  a errores tipográficos.
+
+Todas las claves se normalizan con `normalize_name` de data_preprocessing.py,
+así que tildes, mayúsculas y signos no afectan la búsqueda. Ninguna consulta
+recorre la lista completa de nombres.
+"""
+import heapq
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from data_preprocessing import normalize_name
+
+NGRAM_SIZE = 3
+# Profundidad máxima del trie. Los nodos internos guardan solo las primeras
+# sugerencias; los nodos a esta profundidad guardan todas sus claves
+# ordenadas y las consultas más largas se resuelven con búsqueda binaria.
+TRIE_MAX_DEPTH = 6
+MAX_NODE_SUGGESTIONS = 20
+# Los candidatos difusos salen de los trigramas más raros de la consulta,
+# hasta este presupuesto de entradas de listas invertidas. Los trigramas muy
+# frecuentes aportan poco y son los que dominarían el coste de la consulta.
+MAX_POSTING_ENTRIES = 2000
+# Cuántos de los candidatos empatados por los trigramas raros se desempatan
+# buscando en su nombre los trigramas frecuentes que se saltaron
+MAX_RESCORE_POOL = 200
+MAX_FUZZY_CANDIDATES = 20
+# Las consultas más cortas son autocompletado: se resuelven solo con el trie,
+# sus pocos trigramas aparecen en demasiados nombres para distinguir alguno
+MIN_FUZZY_QUERY_LENGTH = 4
+MIN_FUZZY_SCORE = 0.3
+PREFIX_BONUS = 0.5
+
+
+def _ngrams(text: str) -> set:
+    """
+    Trigramas de un texto normalizado, con espacios de relleno en los bordes
+    """
+    padded = f" {text} "
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+def _name_keys(normalized: str) -> List[Tuple[int, str]]:
+    """
+    Claves de autocompletado: el nombre completo y cada sufijo por palabras,
+    junto con su desplazamiento dentro del nombre
+    """
+    keys = [(0, normalized)]
+    for offset, char in enumerate(normalized):
+        if char == ' ' and offset < 0xFF:
+            keys.append((offset + 1, normalized[offset + 1:]))
+    return keys
+
+
+class NameSearchIndex:
+    """
+    Trie de prefijos + índice invertido de trigramas sobre nombres normalizados
+    """
+
+    def __init__(self, names: List[str]):
+        start = time.perf_counter()
+
+        self.names = list(names)
+        self.normalized = [normalize_name(name) for name in self.names]
+
+        # Nodo del trie: [hijos {carácter: nodo}, ids]. En las hojas (profundidad
+        # TRIE_MAX_DEPTH) cada entrada codifica (id << 8) | desplazamiento de la
+        # clave dentro del nombre normalizado.
+        self._trie = [{}, []]
+        self._postings: Dict[str, array] = {}
+
+        # Insertar en orden alfabético para que las sugerencias de cada nodo
+        # salgan ordenadas sin tener que reordenarlas en cada consulta
+        order = sorted(range(len(self.names)), key=lambda i: self.normalized[i])
+        for idx in order:
+            for offset, key in _name_keys(self.normalized[idx]):
+                self._insert_prefixes(key, idx, offset)
+
+        leaves = [self._trie]
+        while leaves:
+            node = leaves.pop()
+            if isinstance(node[1], array):
+                node[1] = array('Q', sorted(node[1], key=self._leaf_key))
+            leaves.extend(node[0].values())
+
+        for idx, normalized in enumerate(self.normalized):
+            for gram in _ngrams(normalized):
+                posting = self._postings.get(gram)
+                if posting is None:
+                    posting = self._postings[gram] = array('I')
+                posting.append(idx)
+
+        self.build_seconds = time.perf_counter() - start
+        self.memory_bytes = self._estimate_memory()
+
+    def _insert_prefixes(self, key: str, idx: int, offset: int) -> None:
+        node = self._trie
+        for depth, char in enumerate(key[:TRIE_MAX_DEPTH], start=1):
+            children = node[0]
+            child = children.get(char)
+            if child is None:
+                child = children[char] = [{}, array('Q') if depth == TRIE_MAX_DEPTH else []]
+            node = child
+            ids = node[1]
+            if depth == TRIE_MAX_DEPTH:
+                ids.append((idx << 8) | offset)
+            elif len(ids) < MAX_NODE_SUGGESTIONS and idx not in ids:
+                ids.append(idx)
+
+    def _leaf_key(self, entry: int) -> str:
+        return self.normalized[entry >> 8][entry & 0xFF:]
+
+    def _estimate_memory(self) -> int:
+        """
+        Estimación en bytes de la memoria ocupada por el índice
+        """
+        total = sys.getsizeof(self.names) + sys.getsizeof(self.normalized)
+        total += sum(sys.getsizeof(name) for name in self.normalized)
+        total += sys.getsizeof(self._postings)
+        total += sum(sys.getsizeof(g) + sys.getsizeof(p) for g, p in self._postings.items())
+
+        stack = [self._trie]
+        while stack:
+            node = stack.pop()
+            total += sys.getsizeof(node) + sys.getsizeof(node[0]) + sys.getsizeof(node[1])
+            stack.extend(node[0].values())
+        return total
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            'names': len(self.names),
+            'ngrams': len(self._postings),
+            'build_seconds': round(self.build_seconds, 4),
+            'memory_mb': round(self.memory_bytes / (1024 * 1024), 2),
+        }
+
+    def _prefix_matches(self, query: str) -> List[int]:
+        node = self._trie
+        for char in query[:TRIE_MAX_DEPTH]:
+            node = node[0].get(char)
+            if node is None:
+                return []
+
+        if len(query) < TRIE_MAX_DEPTH:
+            return node[1]
+
+        # Hoja del trie: búsqueda binaria sobre sus claves ordenadas
+        entries = node[1]
+        matches = []
+        position = bisect_left(entries, query, key=self._leaf_key)
+        while position < len(entries) and len(matches) < MAX_NODE_SUGGESTIONS:
+            entry = entries[position]
+            if not self._leaf_key(entry).startswith(query):
+                break
+            if entry >> 8 not in matches:
+                matches.append(entry >> 8)
+            position += 1
+        return matches
+
+    def _similarity(self, query: str, query_grams: set, idx: int) -> float:
+        """
+        Coeficiente de Dice entre los trigramas de la consulta y los de la
+        ventana de palabras del nombre que mejor coincide (con tantas palabras
+        como la consulta), para no penalizar consultas parciales
+        """
+        # Cada ventana (con sus espacios de borde) es una subcadena del nombre
+        # con relleno, así que sus trigramas son un tramo de la lista completa
+        padded = f" {self.normalized[idx]} "
+        grams = [padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)]
+        spaces = [i for i, char in enumerate(padded) if char == ' ']
+        width = min(len(query.split()), len(spaces) - 1)
+        best = 0.0
+        for start in range(len(spaces) - width):
+            window = set(grams[spaces[start]:spaces[start + width] - 1])
+            best = max(best, 2.0 * len(query_grams & window) / (len(query_grams) + len(window)))
+        return best
+
+    def _fuzzy_matches(self, query: str, query_grams: set, max_candidates: int) -> Dict[int, float]:
+        grams = sorted((g for g in query_grams if g in self._postings), key=lambda g: len(self._postings[g]))
+
+        counts = Counter()
+        used = 0
+        counted = 0
+        for gram in grams:
+            posting = self._postings[gram]
+            if used + len(posting) > MAX_POSTING_ENTRIES:
+                break
+            counts.update(posting)
+            used += len(posting)
+            counted += 1
+
+        # Si todos los trigramas son frecuentes, los candidatos salen de la
+        # lista más corta
+        if not counts and grams:
+            counts.update(self._postings[grams[0]])
+            counted = 1
+        if not counts:
+            return {}
+
+        # Los trigramas raros suelen empatar a muchos nombres: entre los que
+        # comparten casi tantos como el mejor candidato, deciden los trigramas
+        # frecuentes que se saltaron, buscándolos directamente en el nombre en
+        # vez de recorrer sus listas
+        best = max(counts.values())
+        pool = [idx for idx, common in counts.items() if common == best]
+        if best > 1:
+            pool += [idx for idx, common in counts.items() if common == best - 1]
+        pool = pool[:MAX_RESCORE_POOL]
+        skipped = grams[counted:]
+        if len(pool) > max_candidates and skipped:
+            for idx in pool:
+                counts[idx] += sum(map(f" {self.normalized[idx]} ".__contains__, skipped))
+
+        scores = {}
+        for idx in heapq.nlargest(max_candidates, pool, key=counts.__getitem__):
+            score = self._similarity(query, query_grams, idx)
+            if score >= MIN_FUZZY_SCORE:
+                scores[idx] = score
+        return scores
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """
+        Busca nombres por prefijo y por similitud de trigramas.
+
+        Retorna una lista de {'id', 'name', 'score'} ordenada por score
+        (entre 0 y 1). Los nombres que empiezan (o tienen una palabra que
+        empieza) con la consulta reciben una bonificación sobre su similitud.
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+
+        query_grams = _ngrams(normalized)
+        prefix_matches = self._prefix_matches(normalized)
+        if len(normalized) < MIN_FUZZY_QUERY_LENGTH or len(prefix_matches) >= limit:
+            scores = {}
+        else:
+            # Las coincidencias de prefijo y las difusas comparten el mismo
+            # presupuesto de comparaciones exactas
+            scores = self._fuzzy_matches(normalized, query_grams, MAX_FUZZY_CANDIDATES - len(prefix_matches))
+
+        for idx in prefix_matches:
+            similarity = scores.get(idx)
+            if similarity is None:
+                similarity = self._similarity(normalized, query_grams, idx)
+            scores[idx] = (similarity + PREFIX_BONUS) / (1 + PREFIX_BONUS)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.normalized[item[0]]))
+        return [
+            {'id': self.names[idx], 'name': self.names[idx], 'score': round(score, 3)}
+            for idx, score in ranked[:limit]
+        ]
+
+
+def main():
+    """
+    Mide construcción, memoria y latencia del índice con nombres sintéticos
+    """
+    import random
+
+    random.seed(0)
+    first_names = ['Juan', 'María', 'José', 'Ana', 'Luis', 'Carmen', 'Pedro', 'Lucía', 'Jorge', 'Rosa']
+    last_names = ['Pérez', 'García', 'Rodríguez', 'López', 'Martínez', 'Quispe', 'Huamán', 'Torres', 'Chávez', 'Salazar']
+    syllables = [c + v for c in 'bcdfghjklmnprstvyz' for v in 'aeiou']
+
+    def random_word():
+        return ''.join(random.choice(syllables) for _ in range(random.randint(2, 4))).title()
+
+    names = [
+        f"{random.choice(first_names)} {random_word()} {random.choice(last_names)} {random_word()}"
+        for _ in range(100_000)
+    ]
+
+    index = NameSearchIndex(names)
+    print(f"📊 Índice construido: {index.stats()}")
+
+    def with_typo(word):
+        position = random.randrange(1, len(word))
+        return word[:position] + 'x' + word[position + 1:]
+
+    # Consultas con error tipográfico y el nombre que deberían encontrar
+    typo_queries = {
+        'con error': [(name[:5] + 'x' + name[6:], name) for name in random.sample(names, 500)],
+        'nombre + palabra rara con error': [
+            (f"{name.split()[0]} {with_typo(name.split()[1])}", name) for name in random.sample(names, 500)
+        ],
+        'apellido con error + palabra rara': [
+            (f"{with_typo(name.split()[2])} {name.split()[3]}", name) for name in random.sample(names, 500)
+        ],
+    }
+    queries = {
+        'prefijo 3': [normalize_name(name)[:3] for name in random.sample(names, 500)],
+        'prefijo 8': [normalize_name(name)[:8] for name in random.sample(names, 500)],
+    }
+    queries.update({label: [query for query, _ in group] for label, group in typo_queries.items()})
+
+    def report(label, latencies):
+        latencies.sort()
+        print(f"⏱️ {label}: p50 {latencies[len(latencies) // 2] * 1000:.3f} ms, "
+              f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:.3f} ms, "
+              f"máx {latencies[-1] * 1000:.3f} ms")
+
+    all_latencies = []
+    for label, group in queries.items():
+        latencies = []
+        for query in group:
+            start = time.perf_counter()
+            index.search(query)
+            latencies.append(time.perf_counter() - start)
+        report(f"Latencia ({label})", latencies)
+        all_latencies.extend(latencies)
+    report("Latencia total", all_latencies)
+
+    for label, group in typo_queries.items():
+        found = sum(name in [match['name'] for match in index.search(query)] for query, name in group)
+        print(f"🎯 Recall@10 ({label}): {found / len(group):.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Registro de las etapas de un pipeline y ejecución concurrente de etapas
+independientes.
+
+Cada etapa queda registrada con su intervalo de reloj (inicio y fin
+relativos al inicio del pipeline) y el hilo en que corrió, de modo que se
+pueda comprobar qué etapas se solaparon; el resumen final compara el tiempo
+total con la suma de las etapas (lo que habría tardado en serie).
+
+ProgressReporter informa el avance de los bucles largos (rendimiento y
+tiempo estimado restante).
+"""
+import threading
+import time
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Any, Callable, List, Tuple
+
+
+class StageLog:
+    """
+    Intervalos (nombre, inicio, fin) de las etapas de un pipeline
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans: List[Tuple[str, float, float]] = []
+        self._lock = threading.Lock()
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.origin
+
+    @contextmanager
+    def span(self, name: str):
+        """
+        Registra la duración del bloque como una etapa
+        """
+        start = self.elapsed()
+        try:
+            yield
+        finally:
+            end = self.elapsed()
+            with self._lock:
+                self.spans.append((name, start, end))
+            print(f"⏱️ [{start:7.2f}s → {end:7.2f}s] {name} ({end - start:.2f}s, {threading.current_thread().name})")
+
+    def run(self, name: str, function: Callable, *args, **kwargs) -> Any:
+        with self.span(name):
+            return function(*args, **kwargs)
+
+    def submit(self, executor: Executor, name: str, function: Callable, *args, **kwargs) -> Future:
+        """
+        Ejecuta la etapa en `executor` y retorna su Future
+        """
+        return executor.submit(self.run, name, function, *args, **kwargs)
+
+    def join(self, name: str, future: Future) -> Any:
+        """
+        Espera el resultado de una etapa concurrente, informando cuánto se
+        bloqueó el hilo principal
+        """
+        start = self.elapsed()
+        result = future.result()
+        waited = self.elapsed() - start
+        if waited >= 0.01:
+            print(f"⏳ Espera de '{name}': {waited:.2f}s")
+        return result
+
+    def report(self) -> None:
+        """
+        Muestra todas las etapas ordenadas por inicio y el solapamiento logrado
+        """
+        total = self.elapsed()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span[1])
+        serial = sum(end - start for _, start, end in spans)
+
+        print("\nEtapas del pipeline:")
+        for name, start, end in spans:
+            print(f"  {start:7.2f}s → {end:7.2f}s  {end - start:7.2f}s  {name}")
+        print(f"Tiempo total: {total:.2f}s (suma de etapas: {serial:.2f}s, solapamiento: {max(serial - total, 0):.2f}s)")
+
+
+class ProgressReporter:
+    """
+    Informa el avance de un bucle largo con su rendimiento (elementos por
+    segundo) y el tiempo estimado restante, como máximo cada `interval`
+    segundos
+    """
+
+    def __init__(self, total: int, label: str = 'elementos', interval: float = 5.0):
+        self.total = total
+        self.label = label
+        self.interval = interval
+        self.done = 0
+        self._start = time.perf_counter()
+        self._last_report = self._start
+
+    def advance(self, count: int = 1) -> None:
+        self.done += count
+        now = time.perf_counter()
+        if now - self._last_report >= self.interval or self.done >= self.total:
+            self._last_report = now
+            self.report()
+
+    def report(self) -> None:
+        elapsed = time.perf_counter() - self._start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = (self.total - self.done) / rate if rate > 0 else float('inf')
+        percent = 100 * self.done / self.total if self.total else 100.0
+        eta = _format_duration(remaining) if remaining != float('inf') else '?'
+        print(f"  {self.done}/{self.total} {self.label} ({percent:.1f}%) - {rate:.2f} {self.label}/s, ETA {eta}")
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {seconds:02d}s"
+    return f"{seconds}s"
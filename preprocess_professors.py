@@ -4,6 +4,8 @@ import os
 from typing import Dict, Any, List
 from collections import Counter
 
+from columnar_dataset import dataset_source, load_professors, save_professors
+
 def classify_degree(degree: str) -> str:
     """
     Clasifica un grado académico en una de las categorías: PhD, Master, Bachelor
@@ -421,13 +423,12 @@ def main():
     try:
         print("🔄 Iniciando preprocesamiento de datos de profesores...")
         
-        # Cargar datos originales
-        if not os.path.exists(input_file):
+        # Cargar datos originales (JSON o formato columnar, el más reciente)
+        if dataset_source(input_file) is None:
             print(f"❌ Error: No se encontró el archivo '{input_file}'")
             return
             
-        with open(input_file, 'r', encoding='utf-8') as f:
-            professors_data = json.load(f)
+        professors_data = load_professors(input_file)
         
         print(f"📊 Procesando {len(professors_data)} profesores...")
         
@@ -485,10 +486,9 @@ def main():
                 examples_shown.add(original)
         
         # Guardar datos procesados (reemplazando el archivo original)
-        with open(input_file, 'w', encoding='utf-8') as f:
-            json.dump(professors_data, f, ensure_ascii=False, indent=2)
+        written = save_professors(professors_data, input_file)
         
-        print(f"\n✅ Datos procesados y guardados en: {input_file}")
+        print(f"\n✅ Datos procesados y guardados en: {', '.join(written)}")
         
         # Limpiar archivos temporales
         temp_files = [
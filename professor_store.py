@@ -0,0 +1,134 @@
+"""
+Almacén compacto de solo lectura de los profesores para el servidor web.
+
+Reemplaza al DataFrame de pandas: trabaja directamente sobre las columnas
+codificadas de la instantánea del dataset (dataset_snapshot.py), así que no
+crea objetos por fila salvo cuando se piden registros completos.
+- Campos numéricos (p. ej. `research_papers`): arreglos tipados de numpy.
+- Strings (`normalized_university`, `degree_level`,
+  `normalized_specialization`, ...): códigos int32 sobre una tabla de
+  valores únicos internados con `sys.intern`.
+- `interest_areas` / `interest_scores`: listas estilo CSR (offsets + valores).
+"""
+import sys
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+from co_interest import build_interest_matrix
+from dataset_snapshot import ABSENT, ColumnReader, DatasetSnapshot
+
+
+class ProfessorStore:
+    """
+    Vista de solo lectura sobre las columnas de los profesores
+    """
+
+    def __init__(self, columns: ColumnReader):
+        self._columns = columns
+        self._categories: Dict[str, List[str]] = {}
+        self._names: Optional[List[str]] = None
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Optional[DatasetSnapshot]) -> 'ProfessorStore':
+        if snapshot is None:
+            return cls(ColumnReader({}, {}, 0))
+        return cls(snapshot.columns)
+
+    def __len__(self) -> int:
+        return self._columns.count
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._columns.columns
+
+    def kind(self, column: str) -> str:
+        return self._columns.columns[column]['kind']
+
+    def numeric(self, column: str) -> np.ndarray:
+        """
+        Arreglo tipado de una columna numérica (NaN donde falta el valor)
+        """
+        if self.kind(column) not in ('int', 'float'):
+            raise TypeError(f"La columna '{column}' no es numérica")
+        return self._columns.array(column, 'values')
+
+    def categories(self, column: str) -> List[str]:
+        """
+        Valores únicos (internados) de una columna de strings o listas de strings
+        """
+        if column not in self._categories:
+            if self.kind(column) not in ('str', 'str_list'):
+                raise TypeError(f"La columna '{column}' no es de strings")
+            self._categories[column] = [sys.intern(value) for value in self._columns.table(column).to_list()]
+        return self._categories[column]
+
+    def codes(self, column: str) -> np.ndarray:
+        """
+        Códigos de una columna de strings (-1 para nulos o ausentes)
+        """
+        if self.kind(column) != 'str':
+            raise TypeError(f"La columna '{column}' no es de strings")
+        return self._columns.array(column, 'codes')
+
+    def values(self, column: str) -> List[Any]:
+        """
+        Valores de una columna como objetos de Python, con la misma semántica
+        que `DataFrame[column].tolist()`; los strings se comparten entre filas
+        """
+        if column not in self:
+            return []
+        if self.kind(column) != 'str':
+            return self._columns.values(column)
+
+        table = self.categories(column)
+        result = [table[code] if code >= 0 else None for code in self.codes(column).tolist()]
+        state = self._columns.array(column, 'state')
+        if state is not None:
+            result = [float('nan') if s == ABSENT else value for value, s in zip(result, state.tolist())]
+        return result
+
+    @property
+    def names(self) -> List[str]:
+        """
+        Nombres de los profesores (también son sus ids)
+        """
+        if self._names is None:
+            self._names = self.values('name')
+        return self._names
+
+    def records(self, rows: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        Registros completos (equivalente a `DataFrame.to_dict('records')`),
+        solo de las filas `rows` si se indican
+        """
+        return self._columns.records(rows)
+
+    def interest_matrix(self) -> sparse.csr_matrix:
+        """
+        Matriz dispersa (profesores x áreas) ponderada por score, construida
+        directamente desde las columnas CSR
+        """
+        if 'interest_areas' not in self or 'interest_scores' not in self:
+            return build_interest_matrix([None] * len(self), [None] * len(self))[0]
+
+        area_offsets = self._columns.array('interest_areas', 'offsets')
+        score_offsets = self._columns.array('interest_scores', 'offsets')
+        if (self.kind('interest_areas') != 'str_list' or self.kind('interest_scores') != 'float_list'
+                or not np.array_equal(area_offsets, score_offsets)):
+            # Listas de distinto largo o tipos inesperados: camino general
+            return build_interest_matrix(self.values('interest_areas'), self.values('interest_scores'))[0]
+
+        # Los códigos de la tabla de áreas siguen el orden de primera
+        # aparición, igual que las columnas de build_interest_matrix. Se
+        # copian los arreglos porque los del mmap son de solo lectura
+        matrix = sparse.csr_matrix(
+            (
+                np.array(self._columns.array('interest_scores', 'values'), dtype=np.float32),
+                np.array(self._columns.array('interest_areas', 'values'), dtype=np.int32),
+                np.array(area_offsets, dtype=np.int64),
+            ),
+            shape=(len(self), len(self.categories('interest_areas'))),
+        )
+        matrix.sum_duplicates()
+        return matrix
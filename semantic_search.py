@@ -0,0 +1,123 @@
+"""
+Búsqueda semántica de profesores por temas de investigación.
+
+Usa la matriz de embeddings normalizados que precalcula
+`data_preprocessing.compute_professor_embeddings` y el mismo modelo de
+Sentence Transformers que `_classify_with_similarity`. El modelo se carga una
+sola vez por proceso (en segundo plano al iniciar el servidor) y se mantiene
+en memoria; los embeddings de las consultas se guardan en un caché LRU.
+"""
+import os
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import numpy as np
+
+import data_preprocessing
+
+QUERY_CACHE_SIZE = 1024
+
+
+class SemanticSearchIndex:
+    """
+    Matriz (profesores x dimensión) de embeddings normalizados, alineada con
+    el orden de los profesores del servidor
+    """
+
+    def __init__(self, embeddings_path: str, names: List[str], degree_levels: List[str],
+                 universities: List[str]):
+        self.names = list(names)
+        self.degree_levels = np.array(degree_levels, dtype=object)
+        self.universities = np.array(universities, dtype=object)
+        self.embeddings = None
+        self.model_name = None
+        self._warm_up_thread = None
+
+        if not os.path.exists(embeddings_path):
+            print(f"Aviso: no se encontró '{embeddings_path}', la búsqueda semántica está desactivada.")
+            return
+
+        with np.load(embeddings_path) as data:
+            stored = dict(zip(data['names'].tolist(), range(len(data['names']))))
+            vectors = data['embeddings'].astype(np.float32, copy=False)
+            self.model_name = str(data['model_name'])
+
+        # Alinear con el orden del servidor; los profesores sin embedding
+        # quedan en cero y nunca superan a un resultado real
+        self.embeddings = np.zeros((len(self.names), vectors.shape[1]), dtype=np.float32)
+        rows = [(i, stored[name]) for i, name in enumerate(self.names) if name in stored]
+        if rows:
+            target, source = zip(*rows)
+            self.embeddings[list(target)] = vectors[list(source)]
+
+    @property
+    def available(self) -> bool:
+        return self.embeddings is not None
+
+    def warm_up(self) -> None:
+        """
+        Carga el modelo en un hilo de fondo para que la primera consulta no
+        pague el tiempo de carga
+        """
+        if self.available and self._warm_up_thread is None:
+            self._warm_up_thread = threading.Thread(target=self._load_model, daemon=True)
+            self._warm_up_thread.start()
+
+    def _load_model(self) -> None:
+        _, model_name = data_preprocessing.load_sentence_model()
+        if model_name != self.model_name:
+            print(f"Aviso: los embeddings se calcularon con '{self.model_name}' "
+                  f"pero el servidor cargó '{model_name}'.")
+
+    def search(self, query: str, top_k: int = 10, degree_level: Optional[str] = None,
+               university: Optional[str] = None) -> List[Dict]:
+        """
+        Retorna los `top_k` profesores más similares a la consulta como una
+        lista de {'id', 'name', 'score'}, opcionalmente prefiltrados por
+        `degree_level` y/o `normalized_university`
+        """
+        if not self.available or not query.strip():
+            return []
+
+        candidates = None
+        if degree_level or university:
+            mask = np.ones(len(self.names), dtype=bool)
+            if degree_level:
+                mask &= self.degree_levels == degree_level
+            if university:
+                mask &= self.universities == university
+            candidates = np.flatnonzero(mask)
+            if not len(candidates):
+                return []
+
+        query_vector = _embed_query(query.strip())
+        matrix = self.embeddings if candidates is None else self.embeddings[candidates]
+        scores = matrix @ query_vector
+
+        top_k = min(top_k, len(scores))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for position in top:
+            idx = position if candidates is None else candidates[position]
+            results.append({
+                'id': self.names[idx],
+                'name': self.names[idx],
+                'score': round(float(scores[position]), 3),
+            })
+        return results
+
+
+@lru_cache(maxsize=QUERY_CACHE_SIZE)
+def _embed_query(query: str) -> np.ndarray:
+    """
+    Embedding normalizado de una consulta (de solo lectura, se comparte
+    entre peticiones a través del caché)
+    """
+    model, _ = data_preprocessing.load_sentence_model()
+    vector = np.asarray(model.encode([query])[0], dtype=np.float32)
+    vector /= max(float(np.linalg.norm(vector)), 1e-12)
+    vector.setflags(write=False)
+    return vector
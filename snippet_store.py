@@ -0,0 +1,124 @@
+"""
+Almacén direccionado por contenido de los fragmentos scrapeados.
+
+Un mismo resultado de búsqueda suele aparecer en el `scraped_info` de varios
+profesores. Al ingresar los datos, cada `content` se limpia y se hashea una
+sola vez; los profesores pasan a referenciar el fragmento por su id
+(`snippet_id`) y la extracción de texto y los embeddings trabajan solo sobre
+los fragmentos únicos.
+"""
+import hashlib
+import json
+import re
+from typing import Any, Dict, List
+
+SNIPPETS_FILE = 'scraped_snippets.json'
+
+
+def clean_snippet(content: str) -> str:
+    """
+    Limpieza básica del contenido scrapeado (espacios repetidos)
+    """
+    return re.sub(r'\s+', ' ', content).strip()
+
+
+def snippet_hash(text: str) -> str:
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class SnippetStore:
+    """
+    Fragmentos únicos de texto, identificados por un id entero estable
+    dentro del almacén y por el hash de su contenido limpio
+    """
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.hashes: List[str] = []
+        self._ids_by_hash: Dict[str, int] = {}
+        self._ids_by_raw: Dict[str, int] = {}
+        self.references = 0
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    def add(self, content: str) -> int:
+        """
+        Id del fragmento (agregándolo si es nuevo). Un contenido idéntico a
+        uno ya visto no se vuelve a limpiar ni a hashear.
+        """
+        self.references += 1
+        snippet_id = self._ids_by_raw.get(content)
+        if snippet_id is not None:
+            return snippet_id
+
+        text = clean_snippet(content)
+        digest = snippet_hash(text)
+        snippet_id = self._ids_by_hash.get(digest)
+        if snippet_id is None:
+            snippet_id = len(self.texts)
+            self._ids_by_hash[digest] = snippet_id
+            self.texts.append(text)
+            self.hashes.append(digest)
+        self._ids_by_raw[content] = snippet_id
+        return snippet_id
+
+    def ingest(self, scraped_info: Any) -> Any:
+        """
+        Copia de una lista `scraped_info` donde cada 'content' se reemplaza
+        por su 'snippet_id'
+        """
+        if not isinstance(scraped_info, list):
+            return scraped_info
+
+        result = []
+        for info in scraped_info:
+            if isinstance(info, dict) and isinstance(info.get('content'), str):
+                content = info['content']
+                info = {key: value for key, value in info.items() if key != 'content'}
+                info['snippet_id'] = self.add(content)
+            result.append(info)
+        return result
+
+    def text(self, snippet_id: int) -> str:
+        return self.texts[snippet_id]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Referencias totales, fragmentos únicos y tasa de deduplicación
+        """
+        unique = len(self.texts)
+        return {
+            'references': self.references,
+            'unique_snippets': unique,
+            'raw_variants': len(self._ids_by_raw),
+            'dedup_ratio': round(self.references / unique, 2) if unique else 0.0,
+            'unique_chars': sum(len(text) for text in self.texts),
+        }
+
+    def save(self, path: str = SNIPPETS_FILE) -> None:
+        data = {'snippets': [{'id': i, 'hash': h, 'text': t} for i, (h, t) in enumerate(zip(self.hashes, self.texts))]}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str = SNIPPETS_FILE) -> 'SnippetStore':
+        store = cls()
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for snippet in sorted(data['snippets'], key=lambda s: s['id']):
+            store._ids_by_hash[snippet['hash']] = len(store.texts)
+            store.texts.append(snippet['text'])
+            store.hashes.append(snippet['hash'])
+        return store
+
+
+def snippet_ids(scraped_info: Any) -> List[int]:
+    """
+    Ids de los fragmentos referenciados por una lista `scraped_info`
+    ingresada, sin repetir y en orden
+    """
+    if not isinstance(scraped_info, list):
+        return []
+    ids = [info['snippet_id'] for info in scraped_info if isinstance(info, dict) and 'snippet_id' in info]
+    return list(dict.fromkeys(ids))
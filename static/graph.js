@@ -77,11 +77,37 @@ function forceClusterRepulsion(groups) {
     return force;
 }
 
+// Draws a node's photo inside its <pattern>: from the thumbnail atlas when the
+// URL is in it, otherwise from its individual thumbnail, and from the original
+// URL when no thumbnails have been generated
+function appendNodeImage(pattern, node, diameter, atlas) {
+    const offset = atlas && atlas.tiles[node.url_image];
+    if (offset) {
+        const scale = diameter / atlas.tile_size;
+        pattern.append('image')
+            .attr('xlink:href', atlas.image)
+            .attr('x', -offset[0] * scale)
+            .attr('y', -offset[1] * scale)
+            .attr('width', atlas.width * scale)
+            .attr('height', atlas.height * scale);
+        return;
+    }
+
+    const thumbnail = atlas && atlas.files[node.url_image];
+    pattern.append('image')
+        .attr('xlink:href', thumbnail || node.url_image)
+        .attr('height', diameter) // Match the circle diameter
+        .attr('width', diameter);
+}
+
 document.addEventListener('DOMContentLoaded', () => {
     const graphContainer = document.getElementById('graph-container');
     const tooltip = document.getElementById('tooltip');
     const groupBySelect = document.getElementById('group-by');
+    const sizeBySelect = document.getElementById('size-by');
     const degreeFilterCheckboxes = document.querySelectorAll('#degree-filter input[type="checkbox"]');
+    // Dataset shown by this page (?dataset=<name>; empty for the default one)
+    const datasetName = document.body.dataset.dataset || '';
 
     const width = graphContainer.clientWidth;
     const height = graphContainer.clientHeight || window.innerHeight * 0.8;
@@ -110,6 +136,20 @@ document.addEventListener('DOMContentLoaded', () => {
     let simulation;
     let originalGraphData = { nodes: [], groups: [] };
 
+    // Thumbnail atlas (null when the server has no generated thumbnails)
+    let thumbnailAtlas = null;
+    const thumbnailAtlasReady = fetch('/thumbnails/atlas')
+        .then(response => response.ok ? response.json() : null)
+        .catch(() => null);
+
+    // Above this many professors the graph starts with one supernode per group
+    const LOD_NODE_THRESHOLD = 500;
+    const UNGROUPED_LABEL = 'Sin grupo';
+    const UNGROUPED_COLOR = '#999';
+    let datasetTotal = null;
+    let aggregateData = null;
+    let expandedGroup = null;
+
     function renderGraph(graph) {
         // Reset zoom and pan on new data
         const initialTransform = d3.zoomIdentity.translate(width / 2, height / 2).scale(0.5);
@@ -184,14 +224,16 @@ document.addEventListener('DOMContentLoaded', () => {
             node.groups = groupMap[node.id] || [];
         });
 
-        // Add a scale for node sizes
+        // Add a scale for node sizes (research_papers, pagerank or betweenness)
+        const sizeMetric = sizeBySelect.value;
+        const sizeValue = d => d[sizeMetric] || 0;
         const sizeScale = d3.scaleSqrt()
-            .domain([0, d3.max(graph.nodes, d => d.research_papers)])
+            .domain([0, d3.max(graph.nodes, sizeValue) || 1])
             .range([15, 80]); // Min and max radius size
 
         simulation = d3.forceSimulation(graph.nodes)
             .force('charge', d3.forceManyBody().strength(-250)) // Reduced charge strength
-            .force('collision', d3.forceCollide().radius(d => sizeScale(d.research_papers) + 5)) // Dynamic collision radius
+            .force('collision', d3.forceCollide().radius(d => sizeScale(sizeValue(d)) + 5)) // Dynamic collision radius
             .force('hull', forceHull(graph.groups))
             .force('cluster', forceClusterRepulsion(graph.groups)); // Add cluster repulsion
 
@@ -201,16 +243,13 @@ document.addEventListener('DOMContentLoaded', () => {
         // Define image patterns
         const defs = container.append('defs');
         graph.nodes.forEach(node => {
-            defs.append('pattern')
+            const pattern = defs.append('pattern')
                 .attr('id', `img-${node.id.replace(/\s+/g, '-')}`)
                 .attr('height', 1)
                 .attr('width', 1)
                 .attr('x', '0')
-                .attr('y', '0')
-                .append('image')
-                .attr('xlink:href', node.url_image)
-                .attr('height', d => sizeScale(node.research_papers) * 2) // Match the circle diameter
-                .attr('width', d => sizeScale(node.research_papers) * 2);  // Match the circle diameter
+                .attr('y', '0');
+            appendNodeImage(pattern, node, sizeScale(sizeValue(node)) * 2, thumbnailAtlas);
         });
 
         const node = nodeGroup.selectAll('.node-group')
@@ -237,12 +276,12 @@ document.addEventListener('DOMContentLoaded', () => {
 
         node.append('circle')
             .attr('class', 'node')
-            .attr('r', d => sizeScale(d.research_papers)) // Dynamic radius
+            .attr('r', d => sizeScale(sizeValue(d))) // Dynamic radius
             .style('fill', d => `url(#img-${d.id.replace(/\s+/g, '-')})`);
 
         node.append('text')
             .attr('class', 'node-label')
-            .attr('y', d => -sizeScale(d.research_papers) - 5) // Position above the node circle
+            .attr('y', d => -sizeScale(sizeValue(d)) - 5) // Position above the node circle
             .text(d => d.name);
             
         const hulls = hullGroup.selectAll('.hull')
@@ -274,7 +313,7 @@ document.addEventListener('DOMContentLoaded', () => {
                 // Handle single-person groups by drawing a circle
                 if (nodePoints.length === 1) {
                     const node = nodePoints[0];
-                    const radius = sizeScale(node.research_papers) + 15; // Adjusted radius for single-node hull
+                    const radius = sizeScale(sizeValue(node)) + 15; // Adjusted radius for single-node hull
                     group.centroid = [node.x, node.y];
                     // Define hull points for force calculations
                     group.hullPoints = [
@@ -305,7 +344,8 @@ document.addEventListener('DOMContentLoaded', () => {
                 const padding = 45; // This can remain constant or be dynamic
                 const paddedPoints = hull.map(p => {
                     const angle = Math.atan2(p[1] - group.centroid[1], p[0] - group.centroid[0]);
-                    const nodeRadius = sizeScale(graph.nodes.find(n => n.x === p[0] && n.y === p[1])?.research_papers || 0) || 30;
+                    const hullNode = graph.nodes.find(n => n.x === p[0] && n.y === p[1]);
+                    const nodeRadius = sizeScale(hullNode ? sizeValue(hullNode) : 0) || 30;
                     const dynamicPadding = nodeRadius + 15;
                     return [p[0] + dynamicPadding * Math.cos(angle), p[1] + dynamicPadding * Math.sin(angle)];
                 });
@@ -341,11 +381,107 @@ document.addEventListener('DOMContentLoaded', () => {
             .on('end', dragended);
     }
 
+    // Group-level view: one supernode per group, sized by its members that
+    // match the degree filter, plus one for the professors without a group.
+    // Clicking a supernode loads that group's members.
+    function renderAggregates(selectedDegrees) {
+        const initialTransform = d3.zoomIdentity.translate(width / 2, height / 2).scale(0.5);
+        svg.call(zoom.transform, initialTransform);
+
+        container.selectAll('*').remove();
+        legendGroup.selectAll('*').remove();
+
+        const visibleCount = group => selectedDegrees.reduce((sum, degree) => sum + (group.degree_mix[degree] || 0), 0);
+        const nodes = aggregateData.groups
+            .map((group, i) => ({ ...group, index: i }))
+            .concat([{ ...aggregateData.ungrouped, name: UNGROUPED_LABEL, ungrouped: true }])
+            .map(group => ({ ...group, visible: visibleCount(group) }))
+            .filter(group => group.visible > 0);
+        if (!nodes.length) return;
+
+        const radiusScale = d3.scaleSqrt()
+            .domain([0, d3.max(nodes, d => d.visible) || 1])
+            .range([20, 120]);
+
+        simulation = d3.forceSimulation(nodes)
+            .force('charge', d3.forceManyBody().strength(-300))
+            .force('collision', d3.forceCollide().radius(d => radiusScale(d.visible) + 10));
+
+        const node = container.append('g').selectAll('.supernode-group')
+            .data(nodes)
+            .enter().append('g')
+            .attr('class', 'supernode-group')
+            .call(drag(simulation))
+            .on('click', (event, d) => expandGroup(d))
+            .on('mouseover', (event, d) => {
+                const degrees = Object.entries(d.degree_mix)
+                    .map(([degree, count]) => `${degree}: ${count}`)
+                    .join('<br>');
+                tooltip.style.display = 'block';
+                tooltip.innerHTML = `
+                    <strong>${d.name}</strong><br>
+                    ${d.count} miembros<br>
+                    Investigaciones: ${d.research_papers}<br>
+                    ${degrees}
+                `;
+            })
+            .on('mousemove', (event) => {
+                tooltip.style.left = `${event.pageX + 10}px`;
+                tooltip.style.top = `${event.pageY + 10}px`;
+            })
+            .on('mouseout', () => {
+                tooltip.style.display = 'none';
+            });
+
+        node.append('circle')
+            .attr('class', 'supernode')
+            .attr('r', d => radiusScale(d.visible))
+            .style('fill', d => d.ungrouped ? UNGROUPED_COLOR : color(d.index))
+            .style('stroke', d => d.ungrouped ? UNGROUPED_COLOR : color(d.index));
+
+        node.append('text')
+            .attr('class', 'node-label')
+            .attr('dy', '0.35em')
+            .text(d => `${d.name} (${d.visible})`);
+
+        simulation.on('tick', () => {
+            node.attr('transform', d => `translate(${d.x},${d.y})`);
+        });
+    }
+
+    // Back link shown over an expanded group
+    function renderBackToGroups() {
+        legendGroup.attr('transform', `translate(${width - 300}, 30)`);
+        legendGroup.append('text')
+            .attr('class', 'legend-text legend-item')
+            .attr('y', -10)
+            .text(`← Volver a los grupos (${expandedGroup})`)
+            .on('click', () => {
+                expandedGroup = null;
+                applyFiltersAndRender();
+            });
+    }
+
+    async function expandGroup(group) {
+        const query = group.ungrouped ? 'ungrouped=1' : `name=${encodeURIComponent(group.name)}`;
+        const response = await fetch(withDataset(`/graph-data/group?groupBy=${groupBySelect.value}&${query}`));
+        if (!response.ok) return;
+        originalGraphData = await response.json();
+        expandedGroup = group.name;
+        tooltip.style.display = 'none';
+        applyFiltersAndRender();
+    }
+
     function applyFiltersAndRender() {
         const selectedDegrees = Array.from(degreeFilterCheckboxes)
             .filter(cb => cb.checked)
             .map(cb => cb.value);
 
+        if (aggregateData && !expandedGroup) {
+            renderAggregates(selectedDegrees);
+            return;
+        }
+
         if (selectedDegrees.length === 0) {
             renderGraph({ nodes: [], groups: [] });
             return;
@@ -365,11 +501,72 @@ document.addEventListener('DOMContentLoaded', () => {
             .filter(group => group.members.length > 0);
 
         renderGraph({ nodes: filteredNodes, groups: filteredGroups });
+        if (expandedGroup) renderBackToGroups();
+    }
+
+    // Applies a /graph-data delta (changes since a dataset version) to cached data
+    function applyGraphDelta(data, delta) {
+        const nodesById = new Map(data.nodes.map(node => [node.id, node]));
+        delta.removed.forEach(id => nodesById.delete(id));
+        delta.modified.concat(delta.added).forEach(node => nodesById.set(node.id, node));
+
+        const groups = new Map(data.groups.map(group => [group.name, group.members]));
+        delta.groups.removed.forEach(group => {
+            const removed = new Set(group.members);
+            groups.set(group.name, (groups.get(group.name) || []).filter(id => !removed.has(id)));
+        });
+        delta.groups.added.forEach(group => {
+            groups.set(group.name, (groups.get(group.name) || []).concat(group.members));
+        });
+
+        const result = {
+            nodes: Array.from(nodesById.values()),
+            groups: Array.from(groups, ([name, members]) => ({ name, members })).filter(group => group.members.length > 0)
+        };
+        const modularity = 'modularity' in delta ? delta.modularity : data.modularity;
+        if (modularity !== undefined) result.modularity = modularity;
+        return result;
+    }
+
+    // Data already downloaded per groupBy with its dataset version: when it is
+    // requested again only the changes are downloaded (?since=<version>)
+    const graphDataCache = {};
+
+    function withDataset(url) {
+        return datasetName ? `${url}&dataset=${encodeURIComponent(datasetName)}` : url;
     }
 
     async function fetchDataAndRender(groupBy) {
-        const response = await fetch(`/graph-data?groupBy=${groupBy}`);
-        originalGraphData = await response.json();
+        expandedGroup = null;
+        thumbnailAtlas = await thumbnailAtlasReady;
+
+        // Large datasets start at the group level (?lod=1); the size is
+        // checked once, smaller ones keep downloading every professor
+        if (datasetTotal === null || datasetTotal > LOD_NODE_THRESHOLD) {
+            const lodResponse = await fetch(withDataset(`/graph-data?groupBy=${groupBy}&lod=1`));
+            const lod = lodResponse.ok ? await lodResponse.json() : null;
+            datasetTotal = lod ? lod.total : 0;
+            if (lod && lod.total > LOD_NODE_THRESHOLD) {
+                aggregateData = lod;
+                applyFiltersAndRender();
+                return;
+            }
+        }
+        aggregateData = null;
+
+        const cached = graphDataCache[groupBy];
+        const url = withDataset(cached
+            ? `/graph-data?groupBy=${groupBy}&since=${cached.version}`
+            : `/graph-data?groupBy=${groupBy}`);
+        const response = await fetch(url);
+        const body = await response.json();
+
+        originalGraphData = body.delta ? applyGraphDelta(cached.data, body) : body;
+        graphDataCache[groupBy] = {
+            version: Number(response.headers.get('X-Dataset-Version')),
+            data: originalGraphData
+        };
+
         applyFiltersAndRender();
     }
 
@@ -378,6 +575,8 @@ document.addEventListener('DOMContentLoaded', () => {
         fetchDataAndRender(groupBySelect.value);
     });
 
+    sizeBySelect.addEventListener('change', applyFiltersAndRender);
+
     degreeFilterCheckboxes.forEach(checkbox => {
         checkbox.addEventListener('change', applyFiltersAndRender);
     });
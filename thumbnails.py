@@ -0,0 +1,257 @@
+"""
+Miniaturas locales de las fotos de los profesores.
+
+En lugar de que el navegador descargue cada `url_image` a resolución
+completa para dibujar un círculo pequeño, esta etapa descarga cada imagen
+una sola vez, la recorta al cuadrado y la reduce al diámetro máximo que
+puede tener un nodo en static/graph.js (radio 80 px de `sizeScale`). Las
+miniaturas se guardan en THUMBNAIL_DIR con el hash de la URL como nombre y
+se empaquetan en un atlas (una sola imagen con todas las miniaturas en una
+grilla) más un manifiesto con la posición de cada URL.
+
+La descarga pasa por un `fetcher` intercambiable (función url -> bytes),
+para poder usar una fuente local en lugar de la red.
+
+Debe ejecutarse después de clean_data.py. El servidor sirve el atlas y las
+miniaturas con cabeceras de caché de larga duración, y relee el manifiesto
+si esta etapa se vuelve a ejecutar.
+"""
+import hashlib
+import io
+import json
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+from columnar_dataset import load_professors
+from dataset_snapshot import source_signature
+
+# Radio máximo de un nodo en graph.js (rango de sizeScale) -> diámetro en px
+MAX_NODE_RADIUS = 80
+THUMBNAIL_SIZE = 2 * MAX_NODE_RADIUS
+JPEG_QUALITY = 85
+
+THUMBNAIL_DIR = 'thumbnails'
+ATLAS_MANIFEST = 'atlas.json'
+# Máximo de miniaturas en el atlas (32 x 32 -> 5120 x 5120 px); el resto se
+# sirve como archivos individuales
+MAX_ATLAS_TILES = 1024
+
+FETCH_TIMEOUT = 15
+MAX_FETCH_WORKERS = 8
+
+Fetcher = Callable[[str], bytes]
+
+
+def http_fetcher(url: str) -> bytes:
+    """
+    Descarga una imagen por HTTP(S)
+    """
+    import requests
+
+    response = requests.get(url, timeout=FETCH_TIMEOUT, headers={'User-Agent': 'Network-Profesores/1.0'})
+    response.raise_for_status()
+    return response.content
+
+
+def url_key(url: str) -> str:
+    """
+    Nombre de la miniatura de una URL (hash SHA-1)
+    """
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def make_thumbnail(data: bytes, size: int = THUMBNAIL_SIZE) -> bytes:
+    """
+    Recorta la imagen al cuadrado central, la reduce a `size` x `size` y la
+    codifica en JPEG
+    """
+    from PIL import Image, ImageOps
+
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image).convert('RGB')
+        thumbnail = ImageOps.fit(image, (size, size), Image.LANCZOS)
+
+    output = io.BytesIO()
+    thumbnail.save(output, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+    return output.getvalue()
+
+
+class ThumbnailCache:
+    """
+    Caché en disco de miniaturas, con una entrada por hash de URL
+    """
+
+    def __init__(self, cache_dir: str = THUMBNAIL_DIR, fetcher: Fetcher = http_fetcher):
+        self.cache_dir = cache_dir
+        self.fetcher = fetcher
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path_for(self, url: str) -> str:
+        return os.path.join(self.cache_dir, f"{url_key(url)}.jpg")
+
+    def get(self, url: str) -> Optional[str]:
+        """
+        Ruta de la miniatura de `url`, descargándola solo si no está en caché.
+        Retorna None si la imagen no se pudo descargar o decodificar.
+        """
+        path = self.path_for(url)
+        if os.path.exists(path):
+            return path
+
+        try:
+            thumbnail = make_thumbnail(self.fetcher(url))
+        except Exception as e:
+            print(f"⚠️ No se pudo obtener la imagen '{url}': {e}")
+            return None
+
+        temp_path = f"{path}.tmp{os.getpid()}"
+        with open(temp_path, 'wb') as f:
+            f.write(thumbnail)
+        os.replace(temp_path, path)
+        return path
+
+    def get_many(self, urls: Iterable[str], workers: int = MAX_FETCH_WORKERS) -> Dict[str, str]:
+        """
+        Miniaturas de varias URLs (descargas en paralelo); omite las que fallan
+        """
+        unique = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            paths = list(executor.map(self.get, unique))
+        return {url: path for url, path in zip(unique, paths) if path is not None}
+
+    def build_atlas(self, thumbnails: Dict[str, str]) -> Optional[Dict]:
+        """
+        Empaqueta hasta MAX_ATLAS_TILES miniaturas en una grilla y guarda el
+        atlas y su manifiesto. El nombre del atlas incluye el hash de su
+        contenido para que pueda cachearse indefinidamente; las miniaturas
+        que no entran se listan en 'files' con su nombre de archivo.
+
+        Se conserva también el atlas anterior, que todavía pueden pedir los
+        navegadores y servidores que leyeron el manifiesto previo.
+        """
+        from PIL import Image
+
+        if not thumbnails:
+            return None
+        ordered = sorted(thumbnails)
+        urls, overflow = ordered[:MAX_ATLAS_TILES], ordered[MAX_ATLAS_TILES:]
+
+        columns = math.ceil(math.sqrt(len(urls)))
+        rows = math.ceil(len(urls) / columns)
+        atlas = Image.new('RGB', (columns * THUMBNAIL_SIZE, rows * THUMBNAIL_SIZE), 'white')
+
+        tiles = {}
+        for i, url in enumerate(urls):
+            x, y = (i % columns) * THUMBNAIL_SIZE, (i // columns) * THUMBNAIL_SIZE
+            with Image.open(thumbnails[url]) as tile:
+                atlas.paste(tile.convert('RGB').resize((THUMBNAIL_SIZE, THUMBNAIL_SIZE)), (x, y))
+            tiles[url] = [x, y]
+
+        output = io.BytesIO()
+        atlas.save(output, format='JPEG', quality=JPEG_QUALITY, optimize=True)
+        data = output.getvalue()
+        atlas_file = f"atlas-{hashlib.sha1(data).hexdigest()[:16]}.jpg"
+        with open(os.path.join(self.cache_dir, atlas_file), 'wb') as f:
+            f.write(data)
+
+        manifest = {
+            'image': atlas_file,
+            'tile_size': THUMBNAIL_SIZE,
+            'width': atlas.width,
+            'height': atlas.height,
+            'tiles': tiles,
+            'files': {url: os.path.basename(thumbnails[url]) for url in overflow},
+        }
+        previous = load_atlas_manifest(self.cache_dir)
+        manifest_path = os.path.join(self.cache_dir, ATLAS_MANIFEST)
+        # Reemplazo atómico: el servidor relee el manifiesto mientras corre
+        temp_path = f"{manifest_path}.tmp{os.getpid()}"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(temp_path, manifest_path)
+
+        # Borrar los atlas anteriores salvo el último
+        keep = {atlas_file, previous['image'] if previous else None}
+        for name in os.listdir(self.cache_dir):
+            if name.startswith('atlas-') and name not in keep:
+                os.remove(os.path.join(self.cache_dir, name))
+        return manifest
+
+
+def load_atlas_manifest(cache_dir: str = THUMBNAIL_DIR) -> Optional[Dict]:
+    """
+    Manifiesto del atlas generado por esta etapa (None si no existe)
+    """
+    path = os.path.join(cache_dir, ATLAS_MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class AtlasManifestWatcher:
+    """
+    Manifiesto del atlas para el servidor, releído cuando el archivo cambia
+    en disco (revisado como máximo cada `check_interval` segundos)
+    """
+
+    def __init__(self, cache_dir: str = THUMBNAIL_DIR, check_interval: float = 2.0):
+        self.path = os.path.join(cache_dir, ATLAS_MANIFEST)
+        self.cache_dir = cache_dir
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._signature = source_signature(self.path)
+        self._manifest = load_atlas_manifest(cache_dir)
+        self._last_check = time.monotonic()
+
+    def get(self) -> Optional[Dict]:
+        with self._lock:
+            if time.monotonic() - self._last_check >= self.check_interval:
+                self._last_check = time.monotonic()
+                signature = source_signature(self.path)
+                if signature != self._signature:
+                    self._signature = signature
+                    self._manifest = load_atlas_manifest(self.cache_dir)
+            return self._manifest
+
+
+def main():
+    """
+    Descarga y reduce las fotos de todos los profesores y arma el atlas
+    """
+    input_file = 'profesores_completos.json'
+
+    try:
+        print("🖼️ Generando miniaturas de los profesores...")
+
+        professors_data = load_professors(input_file, columns=['url_image'])
+        urls: List[str] = [p['url_image'] for p in professors_data if isinstance(p.get('url_image'), str) and p['url_image']]
+        print(f"📊 {len(professors_data)} profesores, {len(set(urls))} imágenes distintas")
+
+        cache = ThumbnailCache()
+        cached_before = sum(os.path.exists(cache.path_for(url)) for url in set(urls))
+        thumbnails = cache.get_many(urls)
+        print(f"Miniaturas: {len(thumbnails)} disponibles ({cached_before} ya estaban en caché, "
+              f"{len(set(urls)) - len(thumbnails)} fallidas)")
+
+        manifest = cache.build_atlas(thumbnails)
+        if manifest is None:
+            print("⚠️ No hay imágenes para armar el atlas")
+            return
+
+        atlas_size = os.path.getsize(os.path.join(cache.cache_dir, manifest['image']))
+        print(f"\n✅ Atlas guardado en: {os.path.join(cache.cache_dir, manifest['image'])} "
+              f"({manifest['width']}x{manifest['height']} px, {atlas_size / 1024:.0f} KB)")
+
+    except FileNotFoundError:
+        print(f"❌ Error: No se encontró el archivo '{input_file}'")
+    except Exception as e:
+        print(f"❌ Error inesperado: {e}")
+
+
+if __name__ == "__main__":
+    main()